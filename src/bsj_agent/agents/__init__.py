@@ -1,8 +1,9 @@
-from .bsj_researcher import get_agent as bsj_researcher
-from .bsj_scriptwriter import get_agent as bsj_scriptwriter
-from .bsj_thumbnail_promptor import get_agent as bsj_thumbnail_promptor
-from .bsj_captioner import get_agent as bsj_captioner
-from .bsj_voiceover import get_agent as bsj_voiceover
+"""
+Stub agent getters, imported on first attribute access (PEP 562) so that
+`import bsj_agent.agents` stays cheap.
+"""
+import importlib
+from typing import Any
 
 __all__ = [
     "bsj_researcher",
@@ -11,3 +12,13 @@ __all__ = [
     "bsj_captioner",
     "bsj_voiceover",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name in __all__:
+        # Importing the submodule binds it on the package; rebind the name to
+        # its get_agent so later lookups skip this hook.
+        get_agent = importlib.import_module(f".{name}", __name__).get_agent
+        globals()[name] = get_agent
+        return get_agent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,44 @@
+"""
+bsj_agent.agents._adk
+
+Deferred access to google-adk / google-genai for the agent modules.
+
+Importing ADK pulls in pydantic, protobuf, and the genai client, which costs
+hundreds of ms. Stub-engine runs never touch it, so agent modules call these
+helpers from inside get_agent/create_agent instead of importing at module top.
+"""
+from __future__ import annotations
+
+import functools
+import importlib.util
+from typing import Any, Optional, Tuple
+
+
+@functools.lru_cache(maxsize=None)
+def adk_available() -> bool:
+    """Return True if google-adk is installed, without importing it."""
+    try:
+        return importlib.util.find_spec("google.adk") is not None
+    except Exception:  # pragma: no cover
+        return False
+
+
+@functools.lru_cache(maxsize=None)
+def load_llm_agent() -> Tuple[Optional[Any], Optional[Any]]:
+    """Import and cache (LlmAgent, genai types); (None, None) if ADK is missing."""
+    try:
+        from google.adk.agents import LlmAgent
+        from google.genai import types
+    except Exception:  # pragma: no cover
+        return None, None
+    return LlmAgent, types
+
+
+@functools.lru_cache(maxsize=None)
+def json_config() -> Optional[Any]:
+    """Shared GenerateContentConfig asking for application/json responses."""
+    _, types = load_llm_agent()
+    if types is None:
+        return None
+    return types.GenerateContentConfig(response_mime_type="application/json")
+
@@ -1,29 +1,29 @@
-from typing import Any, Dict
+import functools
+from typing import Any
 
-try:
-    from google.adk.agents import LlmAgent
-except Exception:  # pragma: no cover
-    LlmAgent = None  # type: ignore
+from ..session import SessionState
+from ._adk import adk_available
 
 
+class _Stub:
+    name = "bsj_scriptwriter"
+
+    def run(self, state: SessionState) -> SessionState:
+        if not adk_available():
+            print("[WARN] google-adk not installed. Running bsj_scriptwriter stub.")
+        else:
+            print("[INFO] Using bsj_scriptwriter stub adapter (sync). TODO: wire ADK Runner.")
+        research = state.research
+        state.script = {
+            "beats": ["Intro", "Body", "Conclusion"],
+            "draft": "Placeholder script based on research." if research else "Placeholder script.",
+            "summary": "One-liner summary",
+        }
+        return state
+
+
+@functools.lru_cache(maxsize=None)
 def get_agent() -> Any:
     # Always return a simple sync stub for now so the pipeline runs without
     # requiring ADK's async Runner integration.
-    class _Stub:
-        name = "bsj_scriptwriter"
-
-        def run(self, session: Dict[str, Any]) -> Dict[str, Any]:
-            if LlmAgent is None:
-                print("[WARN] google-adk not installed. Running bsj_scriptwriter stub.")
-            else:
-                print("[INFO] Using bsj_scriptwriter stub adapter (sync). TODO: wire ADK Runner.")
-            session.setdefault("state", {})
-            research = session["state"].get("research", {})
-            session["state"]["script"] = {
-                "beats": ["Intro", "Body", "Conclusion"],
-                "draft": "Placeholder script based on research." if research else "Placeholder script.",
-                "summary": "One-liner summary",
-            }
-            return session
-
     return _Stub()
@@ -9,16 +9,36 @@ GenerateContentConfig to nudge raw JSON outputs.
 """
 from __future__ import annotations
 
-from typing import Any, List
+import operator
+from typing import Any, Final, List
 
-try:
-    from google.adk.agents import LlmAgent
-    from google.genai import types
-except Exception:  # pragma: no cover
-    LlmAgent = None  # type: ignore
-    types = None  # type: ignore
+from .._adk import load_llm_agent
 
-from ...tools.mcp_utils import build_researcher_toolsets
+
+_NAME_GET = operator.attrgetter("name")
+_CLSNAME_GET = operator.attrgetter("__class__.__name__")
+
+
+def _tool_name(tool: Any) -> str:
+    """Tool name for debug logs, falling back to its class name."""
+    if not tool:
+        return "<unknown>"
+    try:
+        return _NAME_GET(tool)
+    except AttributeError:
+        return _CLSNAME_GET(tool)
+
+
+_DESCRIPTION: Final[str] = "Research subtopics, key stats, and citations for the BSJ topic."
+_INSTRUCTION: Final[str] = (
+    "You are the BSJ researcher. Read session.state.topic and stay STRICTLY on that topic.\n"
+    "Use tools FIRST: perform SEARCH using a tool whose name contains 'search' or 'web'; then FETCH full content using a tool whose name contains 'crawl' or 'fetch'. (Examples: Tavily via MCP, Firecrawl via MCP.)\n"
+    "Do not answer until you have used at least one search tool and one fetch/crawl tool. If tools are unavailable, return {\"research\": {\"topics\": [], \"key_stats\": [], \"citations\": []}, \"error\": \"TOOLS_UNAVAILABLE\"}.\n"
+    "Style: Plan -> Tool calls -> Synthesis -> JSON only.\n"
+    "Synthesize facts and key stats ONLY from fetched content.\n"
+    "Respond with ONLY valid JSON as {\"research\": {\"topics\": [], \"key_stats\": [], \"citations\": [{\"title\": \"...\", \"url\": \"...\"}]}}.\n"
+    "Provide at least 3 citations with accurate titles and URLs. Avoid unrelated domains; remain on session.state.topic."
+)
 
 
 def create_agent(*, debug: bool = False) -> Any:
@@ -29,16 +49,21 @@ def create_agent(*, debug: bool = False) -> Any:
     - Enforces JSON output via output_key + response_mime_type
     - Includes before/after tool callbacks when debug=True
     """
+    LlmAgent, _ = load_llm_agent()
     if LlmAgent is None:
         raise RuntimeError("ADK not available. Install google-adk and retry.")
 
+    # mcp_utils pulls in ADK's MCP client, so import it only when building.
+    # Toolsets are cached there per env config and shared across agents.
+    from ...tools.mcp_utils import build_researcher_toolsets
+
     tools: List[Any] = build_researcher_toolsets(debug=debug)
 
     def _debug_before_tool(tool: Any = None, args: dict | None = None, **kwargs):  # minimal, local to agent
         if not debug:
             return
         try:
-            name = getattr(tool, "name", getattr(tool, "__class__", type("_", (), {}))).__class__.__name__ if tool else "<unknown>"
+            name = _tool_name(tool)
             print(f"[TOOL> before] {name} args={args}")
         except Exception:
             pass
@@ -47,7 +72,7 @@ def create_agent(*, debug: bool = False) -> Any:
         if not debug:
             return
         try:
-            name = getattr(tool, "name", getattr(tool, "__class__", type("_", (), {}))).__class__.__name__ if tool else "<unknown>"
+            name = _tool_name(tool)
             preview = str(tool_response)
             if len(preview) > 500:
                 preview = preview[:500] + "...<truncated>"
@@ -55,21 +80,11 @@ def create_agent(*, debug: bool = False) -> Any:
         except Exception:
             pass
 
-    instruction = (
-        "You are the BSJ researcher. Read session.state.topic and stay STRICTLY on that topic.\n"
-        "Use tools FIRST: perform SEARCH using a tool whose name contains 'search' or 'web'; then FETCH full content using a tool whose name contains 'crawl' or 'fetch'. (Examples: Tavily via MCP, Firecrawl via MCP.)\n"
-        "Do not answer until you have used at least one search tool and one fetch/crawl tool. If tools are unavailable, return {\"research\": {\"topics\": [], \"key_stats\": [], \"citations\": []}, \"error\": \"TOOLS_UNAVAILABLE\"}.\n"
-        "Style: Plan -> Tool calls -> Synthesis -> JSON only.\n"
-        "Synthesize facts and key stats ONLY from fetched content.\n"
-        "Respond with ONLY valid JSON as {\"research\": {\"topics\": [], \"key_stats\": [], \"citations\": [{\"title\": \"...\", \"url\": \"...\"}]}}.\n"
-        "Provide at least 3 citations with accurate titles and URLs. Avoid unrelated domains; remain on session.state.topic."
-    )
-
     return LlmAgent(
         name="bsj_researcher",
         model="gemini-2.5-pro",
-        description="Research subtopics, key stats, and citations for the BSJ topic.",
-        instruction=instruction,
+        description=_DESCRIPTION,
+        instruction=_INSTRUCTION,
         tools=tools,
         output_key="research",
         before_tool_callback=_debug_before_tool if debug else None,
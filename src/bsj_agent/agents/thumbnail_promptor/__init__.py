@@ -6,32 +6,28 @@ from session.state.script.summary.
 """
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Final
 
-try:
-    from google.adk.agents import LlmAgent
-    from google.genai import types
-except Exception:  # pragma: no cover
-    LlmAgent = None  # type: ignore
-    types = None  # type: ignore
+from .._adk import json_config, load_llm_agent
+
+
+_DESCRIPTION: Final[str] = "Generate 3 Afrofuturist-style thumbnail prompts."
+_INSTRUCTION: Final[str] = (
+    "Read session.state.script.summary. Output JSON under 'thumbnail_prompts' as an array of 3 strings. No prose outside JSON."
+)
 
 
 def create_agent() -> Any:
+    LlmAgent, _ = load_llm_agent()
     if LlmAgent is None:
         raise RuntimeError("ADK not available. Install google-adk and retry.")
 
-    instruction = (
-        "Read session.state.script.summary. Output JSON under 'thumbnail_prompts' as an array of 3 strings. No prose outside JSON."
-    )
-
     return LlmAgent(
         name="bsj_thumbnail_promptor",
         model="gemini-2.5-flash",
-        description="Generate 3 Afrofuturist-style thumbnail prompts.",
-        instruction=instruction,
+        description=_DESCRIPTION,
+        instruction=_INSTRUCTION,
         output_key="thumbnail_prompts",
         tools=[],
-        generate_content_config=types.GenerateContentConfig(
-            response_mime_type="application/json"
-        ) if types is not None else None,
+        generate_content_config=json_config(),
     )
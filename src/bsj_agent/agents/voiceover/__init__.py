@@ -6,33 +6,29 @@ and research context in session.state.
 """
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Final
 
-try:
-    from google.adk.agents import LlmAgent
-    from google.genai import types
-except Exception:  # pragma: no cover
-    LlmAgent = None  # type: ignore
-    types = None  # type: ignore
+from .._adk import json_config, load_llm_agent
+
+
+_DESCRIPTION: Final[str] = "Transform script into voiceover-ready text."
+_INSTRUCTION: Final[str] = (
+    "Read session.state.script.draft and session.state.topic. Output ONLY JSON under 'voiceover' with key 'text' containing finalized, on-topic narration.\n"
+    "Explicitly reflect at least 2 ideas from session.state.research.topics."
+)
 
 
 def create_agent() -> Any:
+    LlmAgent, _ = load_llm_agent()
     if LlmAgent is None:
         raise RuntimeError("ADK not available. Install google-adk and retry.")
 
-    instruction = (
-        "Read session.state.script.draft and session.state.topic. Output ONLY JSON under 'voiceover' with key 'text' containing finalized, on-topic narration.\n"
-        "Explicitly reflect at least 2 ideas from session.state.research.topics."
-    )
-
     return LlmAgent(
         name="bsj_voiceover",
         model="gemini-2.5-flash",
-        description="Transform script into voiceover-ready text.",
-        instruction=instruction,
+        description=_DESCRIPTION,
+        instruction=_INSTRUCTION,
         output_key="voiceover",
         tools=[],
-        generate_content_config=types.GenerateContentConfig(
-            response_mime_type="application/json"
-        ) if types is not None else None,
+        generate_content_config=json_config(),
     )
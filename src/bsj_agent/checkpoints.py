@@ -0,0 +1,64 @@
+"""
+bsj_agent.checkpoints
+
+Per-phase state snapshots for `run_adk_pipeline`, so a run that fails part way
+can resume after its last completed phase instead of repeating LLM calls.
+
+Set BSJ_CHECKPOINTS=1 to write them. Each phase's state is stored as
+BSJ_CHECKPOINT_DIR/<run_id>/<phase>.json (default dir .bsj_checkpoints),
+written atomically. run_id is derived from the topic, so re-running the same
+topic with resume=True picks up where it stopped.
+"""
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+# Optional fast JSON codec; stdlib json otherwise.
+try:
+    import orjson
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+
+def enabled() -> bool:
+    """True when BSJ_CHECKPOINTS=1."""
+    return os.getenv("BSJ_CHECKPOINTS", "").strip() == "1"
+
+
+def _run_dir(run_id: str) -> Path:
+    return Path(os.getenv("BSJ_CHECKPOINT_DIR", ".bsj_checkpoints")) / run_id
+
+
+def save(run_id: str, phase: str, state: Dict[str, Any]) -> None:
+    """Snapshot `state` after `phase` (no-op unless enabled; disk errors are ignored)."""
+    if not enabled():
+        return
+    directory = _run_dir(run_id)
+    if orjson is not None:
+        blob = orjson.dumps(state, option=orjson.OPT_NON_STR_KEYS, default=str)
+    else:
+        blob = json.dumps(state, ensure_ascii=False, default=str).encode("utf-8")
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        tmp = directory / f"{phase}.json.tmp"
+        tmp.write_bytes(blob)
+        os.replace(tmp, directory / f"{phase}.json")
+    except OSError:
+        pass
+
+
+def load_latest(run_id: str, phases: Sequence[str]) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """Return (phase, state) for the furthest checkpointed phase of `run_id`, if any."""
+    directory = _run_dir(run_id)
+    for phase in reversed(phases):
+        try:
+            raw = (directory / f"{phase}.json").read_bytes()
+            state = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        except (OSError, ValueError):
+            continue
+        if isinstance(state, dict):
+            return phase, state
+    return None
@@ -1,11 +1,24 @@
 import argparse
+import asyncio
 import json
 import os
+import re
+import sys
+from collections import deque
+from dataclasses import dataclass, field
 from pathlib import Path
 from dotenv import load_dotenv
 from typing import Any, Optional
 
-from .workflow import BsjPipeline, run_adk_pipeline
+from .workflow import BsjPipeline, build_bsj_adk_agent, run_adk_pipeline
+
+# Optional fast JSON codec; the stdlib json module remains the fallback.
+try:
+    import orjson
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+_json_loads = orjson.loads if orjson is not None else json.loads
 
 
 # Load environment variables.
@@ -26,19 +39,171 @@ def _run_stub(topic: str, include_newsletter: bool) -> dict[str, Any]:
 
 def _extract_text(content) -> str:
     # content is google.genai.types.Content
-    if not content or not getattr(content, "parts", None):
+    parts = getattr(content, "parts", None) if content else None
+    if not parts:
         return ""
-    texts = []
-    for p in content.parts:
-        if getattr(p, "text", None):
-            texts.append(p.text)
-    return "\n".join(texts).strip()
+    return "\n".join(p.text for p in parts if getattr(p, "text", None)).strip()
+
+
+def _first_text(content) -> str:
+    """Return the first non-empty text part of a Content, or ""."""
+    parts = getattr(content, "parts", None) if content else None
+    if not parts:
+        return ""
+    return next((t for t in (getattr(p, "text", None) for p in parts) if t), "")
+
+
+# Leading ```lang line and trailing ``` fence around model JSON output
+_FENCE_RE = re.compile(r"\A```[^\n]*\n|\n?```\Z")
+_JSON_DECODER = json.JSONDecoder()
+
+# Stage agents in the ADK graph and the state key each one writes via output_key.
+_STAGE_KEYS = {
+    "bsj_researcher": "research",
+    "bsj_scriptwriter": "script",
+    "bsj_thumbnail_promptor": "thumbnail_prompts",
+    "bsj_captioner": "captions",
+    "bsj_voiceover": "voiceover",
+}
+
+# Empty value per stage key, as a factory so each run gets fresh containers
+_STATE_DEFAULTS = (
+    ("research", dict),
+    ("script", dict),
+    ("thumbnail_prompts", list),
+    ("captions", dict),
+    ("voiceover", dict),
+)
+
+
+def _fill_state_defaults(state: dict[str, Any]) -> None:
+    """Fill any stage key the run did not produce with its empty value."""
+    for key, factory in _STATE_DEFAULTS:
+        if key not in state:
+            state[key] = factory()
+
+
+def _parse_json_text(raw: str) -> Any:
+    """Parse model text as JSON, tolerating code fences and surrounding prose."""
+    raw = _FENCE_RE.sub("", raw.strip()).strip()
+    try:
+        return _json_loads(raw)
+    except Exception:
+        pass
+    # Decode the first complete object in C instead of scanning for braces
+    start = raw.find("{")
+    if start < 0:
+        return None
+    try:
+        return _JSON_DECODER.raw_decode(raw, start)[0]
+    except Exception:
+        pass
+    # Last resort: outermost brace pair
+    end = raw.rfind("}")
+    if end > start:
+        try:
+            return _json_loads(raw[start : end + 1])
+        except Exception:
+            return None
+    return None
+
+
+def _coerce_stage_value(key: str, value: Any, parsed: Optional[dict[str, Any]] = None) -> Any:
+    """
+    Parse a stage's output_key value and unwrap a redundant top-level `key`.
+
+    `parsed` maps stripped raw text to an already decoded value, so text that
+    was parsed while streaming is not decoded a second time from state.
+    """
+    if isinstance(value, str):
+        raw = value.strip()
+        hit = parsed.get(raw) if parsed else None
+        if hit is None:
+            hit = _parse_json_text(raw)
+            if parsed is not None and hit is not None:
+                parsed[raw] = hit
+        value = hit
+    if isinstance(value, dict) and key in value:
+        value = value[key]
+    return value
+
+
+# Upstream stages whose output every later stage depends on. If one of these
+# finishes with unparseable JSON, the rest of the run would only burn tokens.
+_GATING_AUTHORS = ("bsj_researcher", "bsj_scriptwriter")
+
+
+@dataclass(slots=True)
+class _StreamSummary:
+    """What _run_adk keeps from the event stream, instead of every Event."""
+    count: int = 0
+    # Latest non-empty text per author, most recently updated author last
+    last_texts: dict[str, str] = field(default_factory=dict)
+    # Last few events for --debug; None when not debugging
+    ring: Optional[deque] = None
+
+
+async def _consume_adk_events(
+    runner: Any, user_msg: Any, parsed: dict[str, Any], *, debug: bool = False
+) -> tuple[_StreamSummary, Optional[str]]:
+    """
+    Drain `runner.run_async` once, keeping only each author's latest text and
+    (when debugging) a ring of the last 10 events, and validate each gating
+    stage as soon as its final response arrives. Returns (summary,
+    reject_reason); on rejection the event stream is closed early so downstream
+    agents never start. Decoded gating outputs are kept in `parsed` for the
+    state read-back.
+    """
+    summary = _StreamSummary(ring=deque(maxlen=10) if debug else None)
+    last_texts = summary.last_texts
+    ring = summary.ring
+    agen = runner.run_async(
+        user_id="bsj_user",
+        session_id="bsj_session",
+        new_message=user_msg,
+    )
+    try:
+        async for ev in agen:
+            summary.count += 1
+            if ring is not None:
+                ring.append(ev)
+            author = getattr(ev, "author", "")
+            text = _extract_text(getattr(ev, "content", None))
+            if text:
+                # Re-insert so dict order tracks the most recent output
+                last_texts.pop(author, None)
+                last_texts[author] = text
+            if author not in _GATING_AUTHORS:
+                continue
+            is_final = getattr(ev, "is_final_response", None)
+            if not callable(is_final) or not is_final():
+                continue
+            if text and _coerce_stage_value(_STAGE_KEYS[author], text, parsed) is None:
+                return summary, f"{author} output not valid JSON; aborted before downstream stages. Raw: {text[:4000]}"
+    finally:
+        await agen.aclose()
+    return summary, None
+
+
+def _debug_dump_events(summary: _StreamSummary) -> None:
+    """Print a summary of the last few ADK events (content and state changes)."""
+    try:
+        print(f"[DEBUG] ADK events received: {summary.count}")
+        for i, ev in enumerate(summary.ring or ()):  # ring holds the last 10
+            first = _first_text(getattr(ev, "content", None))
+            state_delta = getattr(ev, "state_delta", None)
+            state_keys = list(state_delta) if isinstance(state_delta, dict) else None
+            print(
+                f"[DEBUG] Event[{i}] {type(ev).__name__} author={getattr(ev, 'author', None)} "
+                f"has_text={bool(first)} state_delta_keys={state_keys} preview={first[:120]!r}"
+            )
+    except Exception:
+        pass
 
 
 def _run_adk(topic: str, *, debug: bool = False) -> tuple[Optional[dict], Optional[str]]:
     """Return (session_state, error_message)."""
     try:
-        from google.adk.agents import LlmAgent
         from google.adk.runners import InMemoryRunner
         from google.genai import types
     except Exception as e:
@@ -50,21 +215,12 @@ def _run_adk(topic: str, *, debug: bool = False) -> tuple[Optional[dict], Option
             "Missing Google auth. Set GOOGLE_API_KEY for Gemini API or GOOGLE_APPLICATION_CREDENTIALS for Vertex."
         )
 
-    # Root agent: single-pass generation of BSJ outputs into a JSON blob
-    root = LlmAgent(
-        name="bsj_root",
-        model="gemini-2.5-flash",
-        description="Produce BSJ research, script, prompts, captions, and voiceover fields as JSON.",
-        instruction=(
-            "You are the Black Street Journal (BSJ) content generator. Given a topic, produce a concise,"
-            " factual, culturally grounded output in this strict JSON schema under key bsj_output: "
-            "{research:{topics:[], key_stats:[], citations:[{title, url}]}, script:{beats:[], draft, summary},"
-            " thumbnail_prompts:[3 strings], captions:{youtube:[], tiktok:[], instagram:[], hashtags:[]},"
-            " voiceover:{text, voice_id?}}. Only output JSON (no prose)."
-        ),
-        output_key="bsj_output",
-        tools=[],
-    )
+    # Root agent: the shared pipeline graph, each stage writing its own key
+    # into session.state
+    try:
+        root = build_bsj_adk_agent(debug=debug)
+    except Exception as e:
+        return None, f"ADK graph construction failed: {e}"
 
     runner = InMemoryRunner(agent=root)
 
@@ -84,43 +240,21 @@ def _run_adk(topic: str, *, debug: bool = False) -> tuple[Optional[dict], Option
     # Initialize a session and run with the user's topic as text content
     user_msg = types.Content(role="user", parts=[types.Part(text=f"Topic: {topic}")])
 
+    # Raw stage text -> decoded JSON, shared by the gating checks and read-back
+    parsed: dict[str, Any] = {}
     try:
-        events = list(
-            runner.run(
-                user_id="bsj_user",
-                session_id="bsj_session",
-                new_message=user_msg,
-            )
-        )
+        stream, reject = asyncio.run(_consume_adk_events(runner, user_msg, parsed, debug=debug))
     except Exception as e:
         return None, f"ADK run failed: {e}"
+    if reject:
+        return None, reject
 
-    # Debug: inspect last few events for content and state changes
     if debug:
-        try:
-            print(f"[DEBUG] ADK events received: {len(events)}")
-            for i, ev in enumerate(events[-10:]):  # limit to last 10 to avoid noise
-                etype = type(ev).__name__
-                author = getattr(ev, "author", None)
-                content = getattr(ev, "content", None)
-                has_text = False
-                preview = ""
-                if content and getattr(content, "parts", None):
-                    for p in content.parts:
-                        if getattr(p, "text", None):
-                            has_text = True
-                            preview = (p.text or "")[:120]
-                            break
-                state_delta = getattr(ev, "state_delta", None)
-                state_keys = list(state_delta.keys()) if isinstance(state_delta, dict) else None
-                print(
-                    f"[DEBUG] Event[{i}] {etype} author={author} has_text={has_text} "
-                    f"state_delta_keys={state_keys} preview={preview!r}"
-                )
-        except Exception:
-            pass
+        _debug_dump_events(stream)
 
-    # Try to read the final session state from the in-memory session service first
+    # Read each stage's output_key back from the in-memory session service
+    session: dict[str, Any] = {"state": {"topic": topic}}
+    found = False
     try:
         sess = runner._in_memory_session_service.get_session_sync(  # type: ignore[attr-defined]
             app_name=runner.app_name,
@@ -131,89 +265,35 @@ def _run_adk(topic: str, *, debug: bool = False) -> tuple[Optional[dict], Option
         if debug:
             try:
                 print(f"[DEBUG] Session state top-level keys: {list(state.keys()) if isinstance(state, dict) else type(state)}")
-                if isinstance(state, dict):
-                    for k in ("bsj_output", "output", "state"):
-                        if k in state:
-                            v = state[k]
-                            print(f"[DEBUG] Found key '{k}' in state: type={type(v).__name__}")
             except Exception:
                 pass
-        if isinstance(state, dict) and state:
-            bsj = state.get("bsj_output") or state.get("output") or None
-            # If ADK stored JSON as string, parse it
-            if isinstance(bsj, str):
-                raw = bsj.strip()
-                if raw.startswith("```"):
-                    # strip fenced code block
-                    first_nl = raw.find("\n")
-                    if first_nl != -1:
-                        raw = raw[first_nl + 1 :]
-                    if raw.endswith("```"):
-                        raw = raw[:-3]
-                    raw = raw.strip()
-                try:
-                    bsj = json.loads(raw)
-                except Exception:
-                    # Try to recover braces
-                    s = raw.find("{")
-                    e = raw.rfind("}")
-                    if s >= 0 and e > s:
-                        try:
-                            bsj = json.loads(raw[s : e + 1])
-                        except Exception:
-                            bsj = None
-                    else:
-                        bsj = None
-            # Unwrap if the parsed dict still has a top-level 'bsj_output'
-            if isinstance(bsj, dict) and "bsj_output" in bsj and isinstance(bsj["bsj_output"], dict):
-                bsj = bsj["bsj_output"]
-            if isinstance(bsj, dict):
-                session: dict[str, Any] = {"state": {"topic": topic}}
-                session["state"]["research"] = bsj.get("research", {})
-                session["state"]["script"] = bsj.get("script", {})
-                session["state"]["thumbnail_prompts"] = bsj.get("thumbnail_prompts", [])
-                session["state"]["captions"] = bsj.get("captions", {})
-                session["state"]["voiceover"] = bsj.get("voiceover", {})
-                return session, None
+        if isinstance(state, dict):
+            for key in _STAGE_KEYS.values():
+                value = _coerce_stage_value(key, state.get(key), parsed)
+                if value is not None:
+                    session["state"][key] = value
+                    found = True
     except Exception:
         # Ignore and fall back to parsing streamed content
         pass
 
-    # Find last event with textual content (author may be agent name rather than 'model')
-    model_text = ""
-    for ev in events:
-        content = getattr(ev, "content", None)
-        if content:
-            extracted = _extract_text(content)
-            if extracted:
-                model_text = extracted
-
-    if not model_text:
-        return None, "No model output captured."
+    # Fall back to the last textual event of each stage agent
+    if not found:
+        texts_by_author = stream.last_texts
+        if not texts_by_author:
+            return None, "No model output captured."
+        for author, key in _STAGE_KEYS.items():
+            if author in texts_by_author:
+                value = _coerce_stage_value(key, texts_by_author[author], parsed)
+                if value is not None:
+                    session["state"][key] = value
+                    found = True
+        if not found:
+            raw = next(reversed(texts_by_author.values()))
+            return None, f"Model output not JSON. Raw: {raw[:4000]}"
 
-    # Try to parse as JSON
-    try:
-        data = json.loads(model_text)
-    except Exception:
-        # Try to recover from fenced blocks
-        start = model_text.find("{")
-        end = model_text.rfind("}")
-        if start >= 0 and end > start:
-            try:
-                data = json.loads(model_text[start : end + 1])
-            except Exception as e:
-                return None, f"Model output not valid JSON: {e}\nRaw: {model_text[:4000]}"
-        else:
-            return None, f"Model output not JSON. Raw: {model_text[:4000]}"
-
-    # Map into our session.state shape
-    session: dict[str, Any] = {"state": {"topic": topic}}
-    bsj = data.get("bsj_output", data)
-    session["state"]["research"] = bsj.get("research", {})
-    session["state"]["script"] = bsj.get("script", {})
-    session["state"]["thumbnail_prompts"] = bsj.get("thumbnail_prompts", [])
-    session["state"]["captions"] = bsj.get("captions", {})
-    session["state"]["voiceover"] = bsj.get("voiceover", {})
+    # Keep the session.state shape stable for downstream consumers
+    _fill_state_defaults(session["state"])
     return session, None
 
 
@@ -275,7 +355,12 @@ def main() -> int:
         session = _run_stub(args.topic, args.include_newsletter)
 
     if args.print_json:
-        print(json.dumps(session, indent=2, ensure_ascii=False))
+        if orjson is not None:
+            sys.stdout.flush()
+            sys.stdout.buffer.write(orjson.dumps(session, option=orjson.OPT_INDENT_2, default=str) + b"\n")
+            sys.stdout.buffer.flush()
+        else:
+            print(json.dumps(session, indent=2, ensure_ascii=False))
     else:
         state = session.get("state", {})
         print("=== BSJ Pipeline Complete ===")
@@ -0,0 +1,36 @@
+"""
+bsj_agent.session
+
+Typed session.state for the stub pipeline. Stages read and write attributes
+instead of chained `session["state"].get(..., {})` lookups; `to_dict` converts
+back to the plain-dict shape at the output boundary (e.g. --print-json).
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+@dataclass(slots=True)
+class SessionState:
+    topic: str = ""
+    research: Dict[str, Any] = field(default_factory=dict)
+    script: Dict[str, Any] = field(default_factory=dict)
+    thumbnail_prompts: List[str] = field(default_factory=list)
+    captions: Dict[str, Any] = field(default_factory=dict)
+    voiceover: Dict[str, Any] = field(default_factory=dict)
+    newsletter: Optional[Dict[str, Any]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the plain session.state dict used by the rest of the app."""
+        out: Dict[str, Any] = {
+            "topic": self.topic,
+            "research": self.research,
+            "script": self.script,
+            "thumbnail_prompts": self.thumbnail_prompts,
+            "captions": self.captions,
+            "voiceover": self.voiceover,
+        }
+        if self.newsletter is not None:
+            out["newsletter"] = self.newsletter
+        return out
@@ -0,0 +1,179 @@
+"""
+bsj_agent.stage_cache
+
+Opt-in exact-match cache for ADK stage outputs in `run_adk_pipeline`.
+
+Set BSJ_CACHE=1 to enable. A stage's output is keyed by everything that
+determines its prompt: agent name, model, instruction, output key, and the
+input session.state. Re-running the same topic (dev loops, tests) then skips
+the Gemini call for every unchanged stage. Entries live in an in-process LRU
+and, as a second tier, as JSON files under BSJ_CACHE_DIR (default .bsj_cache).
+
+Stages whose only input is the topic can also match paraphrased topics: set
+BSJ_CACHE_SIMILARITY (e.g. 0.87) to reuse the output of the most similar
+earlier topic whose character-trigram cosine similarity reaches that value.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import os
+import re
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+# Optional fast JSON codec for keys and entries; stdlib json otherwise.
+try:
+    import orjson
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# Sentinel for a cache miss (None is a valid cached value in principle)
+MISS = object()
+
+_MEMORY_MAX = 256
+_memory: "OrderedDict[str, Any]" = OrderedDict()
+
+# Per-stage topic index for similarity lookups: stage -> {topic: (vector, norm, key)}
+_SIMILAR_MAX = 1000
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_similar: Dict[str, "OrderedDict[str, Tuple[Counter, float, str]]"] = {}
+
+
+def enabled() -> bool:
+    """True when BSJ_CACHE=1; read per call so tests can toggle it."""
+    return os.getenv("BSJ_CACHE", "").strip() == "1"
+
+
+def _cache_dir() -> Path:
+    return Path(os.getenv("BSJ_CACHE_DIR", ".bsj_cache"))
+
+
+def _prompt_hash(agent: Any, expected_key: str, digest_size: int) -> "hashlib._Hash":
+    model = getattr(agent, "model", "")
+    model = getattr(model, "model", model)  # BaseLlm object -> its name
+    h = hashlib.blake2b(digest_size=digest_size)
+    for part in (getattr(agent, "name", ""), str(model), getattr(agent, "instruction", ""), expected_key):
+        h.update(str(part).encode("utf-8"))
+        h.update(b"\0")
+    return h
+
+
+def stage_key(agent: Any, expected_key: str, state: Dict[str, Any]) -> str:
+    """Content hash of one stage invocation."""
+    # meta only records reviews/validation; agents never read it
+    inputs = {k: v for k, v in state.items() if k != "meta"}
+    h = _prompt_hash(agent, expected_key, 20)
+    h.update(_dump_bytes(inputs, sort_keys=True))
+    return h.hexdigest()
+
+
+def stage_id(agent: Any, expected_key: str) -> str:
+    """Short id of a stage's prompt, so similarity indexes reset when it changes."""
+    return f"{getattr(agent, 'name', 'stage')}-{_prompt_hash(agent, expected_key, 6).hexdigest()}"
+
+
+def get(key: str) -> Any:
+    """Cached stage output for `key`, or MISS."""
+    if key in _memory:
+        _memory.move_to_end(key)
+        return _memory[key]
+    try:
+        value = _json_loads((_cache_dir() / f"{key}.json").read_bytes())
+    except (OSError, ValueError):
+        return MISS
+    _remember(key, value)
+    return value
+
+
+def put(key: str, value: Any) -> None:
+    """Store a stage output in memory and on disk (disk errors are ignored)."""
+    _remember(key, value)
+    directory = _cache_dir()
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        tmp = directory / f"{key}.json.tmp"
+        tmp.write_bytes(_dump_bytes(value))
+        os.replace(tmp, directory / f"{key}.json")
+    except OSError:
+        pass
+
+
+def _dump_bytes(value: Any, *, sort_keys: bool = False) -> bytes:
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(value, option=option, default=str)
+    return json.dumps(value, ensure_ascii=False, sort_keys=sort_keys, default=str).encode("utf-8")
+
+
+def _remember(key: str, value: Any) -> None:
+    _memory[key] = value
+    _memory.move_to_end(key)
+    if len(_memory) > _MEMORY_MAX:
+        _memory.popitem(last=False)
+
+
+def similarity_threshold() -> Optional[float]:
+    """BSJ_CACHE_SIMILARITY as a float in (0, 1], or None when unset/invalid."""
+    raw = os.getenv("BSJ_CACHE_SIMILARITY", "").strip()
+    try:
+        value = float(raw)
+    except ValueError:
+        return None
+    return value if 0.0 < value <= 1.0 else None
+
+
+def _topic_vector(topic: str) -> Tuple[Counter, float]:
+    text = " ".join(_WORD_RE.findall(topic.lower()))
+    grams = Counter(text[i : i + 3] for i in range(max(len(text) - 2, 1)))
+    return grams, math.sqrt(sum(c * c for c in grams.values())) or 1.0
+
+
+def _similar_index(stage: str) -> "OrderedDict[str, Tuple[Counter, float, str]]":
+    index = _similar.get(stage)
+    if index is None:
+        index = _similar[stage] = OrderedDict()
+        try:
+            saved = _json_loads((_cache_dir() / f"similar-{stage}.json").read_bytes())
+        except (OSError, ValueError):
+            saved = {}
+        for topic, key in saved.items():
+            index[topic] = (*_topic_vector(topic), key)
+    return index
+
+
+def find_similar(stage: str, topic: str, threshold: float) -> Optional[str]:
+    """Cache key of the most similar indexed topic for `stage`, if >= threshold."""
+    index = _similar_index(stage)
+    if not index:
+        return None
+    grams, norm = _topic_vector(topic)
+    best_key, best = None, threshold
+    for other, other_norm, key in index.values():
+        # Iterate the smaller Counter; missing grams contribute nothing
+        small, large = (grams, other) if len(grams) <= len(other) else (other, grams)
+        score = sum(c * large[g] for g, c in small.items() if g in large) / (norm * other_norm)
+        if score >= best:
+            best_key, best = key, score
+    return best_key
+
+
+def index_topic(stage: str, topic: str, key: str) -> None:
+    """Record that `topic` produced cache entry `key` for `stage`."""
+    index = _similar_index(stage)
+    index[topic] = (*_topic_vector(topic), key)
+    index.move_to_end(topic)
+    while len(index) > _SIMILAR_MAX:
+        index.popitem(last=False)
+    directory = _cache_dir()
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        tmp = directory / f"similar-{stage}.json.tmp"
+        tmp.write_bytes(_dump_bytes({t: entry[2] for t, entry in index.items()}))
+        os.replace(tmp, directory / f"similar-{stage}.json")
+    except OSError:
+        pass
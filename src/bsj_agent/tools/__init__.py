@@ -1,9 +1,10 @@
-from .tool_web_search import tool_web_search
+from .tool_web_search import tool_web_search, tool_web_search_batch
 from .tool_fetch_url import tool_fetch_url
 from .tool_elevenlabs_tts import tool_elevenlabs_tts
 
 __all__ = [
     "tool_web_search",
+    "tool_web_search_batch",
     "tool_fetch_url",
     "tool_elevenlabs_tts",
 ]
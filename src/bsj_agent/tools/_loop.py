@@ -0,0 +1,37 @@
+"""
+bsj_agent.tools._loop
+
+One long-lived asyncio loop on a daemon thread for sync callers of async MCP
+tools. Each asyncio.run() would build and tear down a loop, and MCP sessions
+opened on one loop cannot be reused from another; submitting to this loop
+keeps cached toolsets and their HTTP connections alive across sync calls.
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import threading
+from typing import Any, Coroutine, Optional
+
+
+class AsyncLoopThread:
+    """An event loop running forever on a background daemon thread."""
+
+    def __init__(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self.loop.run_forever, name="bsj-async-loop", daemon=True
+        )
+        self._thread.start()
+
+    def run(self, coro: Coroutine[Any, Any, Any], timeout: Optional[float] = None) -> Any:
+        """Run `coro` on the loop and block until it finishes; re-raises errors."""
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("AsyncLoopThread.run() called from its own loop; await instead.")
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+
+@functools.lru_cache(maxsize=None)
+def get_loop_thread() -> AsyncLoopThread:
+    """Process-wide AsyncLoopThread, started on first use."""
+    return AsyncLoopThread()
@@ -18,6 +18,7 @@ from __future__ import annotations
 import asyncio
 import json
 import os
+import re
 from typing import Any
 
 try:
@@ -29,24 +30,71 @@ try:
 except Exception as e:  # pragma: no cover - smoke tool guard
     raise SystemExit(f"ADK MCP imports failed: {e}. Ensure google-adk is installed.")
 
+from .mcp_utils import ToolRunCache, get_toolset_index, truncating_repr
+
+
+# Optional fast JSON encoder for response previews; stdlib json otherwise.
+try:
+    import orjson
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+# First URL in a search response, used as the fetch target. Matched against
+# the encoded response so only the URL itself is decoded.
+_URL_RE = re.compile(rb"https?://[\w\-./%?#=&:]+")
+
+_PREVIEW_BYTES = 600
+
+
+def _encode_response(resp: Any) -> bytes:
+    """Serialize a tool response to UTF-8 JSON bytes (str responses as-is)."""
+    if isinstance(resp, (bytes, bytearray)):
+        return bytes(resp)
+    if isinstance(resp, str):
+        return resp.encode("utf-8")
+    if orjson is not None:
+        return orjson.dumps(resp)
+    return json.dumps(resp, ensure_ascii=False).encode("utf-8")
+
+
+def _preview(data: bytes) -> str:
+    """Decode only the first _PREVIEW_BYTES of `data` for printing."""
+    head = bytes(memoryview(data)[:_PREVIEW_BYTES]).decode("utf-8", errors="replace")
+    return f"{head}...<truncated>" if len(data) > _PREVIEW_BYTES else head
+
+
+def _preview_response(resp: Any) -> str:
+    """
+    Preview a response without serializing all of it. Used where, unlike the
+    search response, the full encoding is not needed for anything else.
+    """
+    if isinstance(resp, (str, bytes, bytearray)):
+        return _preview(_encode_response(resp))
+    return truncating_repr(resp, _PREVIEW_BYTES, suffix="...<truncated>")[0]
+
+
+# Read-only search/fetch responses, reused when the same call repeats
+_RUN_CACHE = ToolRunCache()
+
 
 async def _list_and_sample(toolset: MCPToolset, label: str, query: str) -> None:
     print(f"\n== {label} ==")
     # List tools
-    tools = await toolset.get_tools()
-    names = [getattr(t, "name", t.__class__.__name__) for t in tools]
+    index = await get_toolset_index(toolset)
+    names = [getattr(t, "name", t.__class__.__name__) for t in index.tools]
     print(f"Tools ({len(names)}): {names}")
 
     # Heuristic: pick a search-like tool, then a fetch/crawl-like tool
-    search_tool = next((t for t in tools if any(k in t.name.lower() for k in ("search", "web"))), None)
-    fetch_tool = next((t for t in tools if any(k in t.name.lower() for k in ("crawl", "fetch", "scrape"))), None)
+    search_tool = index.search
+    fetch_tool = index.fetch
 
+    search_data = b""
     if search_tool:
         try:
             print(f"[CALL] {search_tool.name} -> query='{query}'")
-            resp: Any = await search_tool.run_async(args={"query": query})  # type: ignore[attr-defined]
-            preview = json.dumps(resp, ensure_ascii=False) if not isinstance(resp, str) else resp
-            print(f"[RESP] {search_tool.name}: {preview[:600]}{'...<truncated>' if len(preview) > 600 else ''}")
+            resp: Any = await _RUN_CACHE.cached_call(search_tool, {"query": query})
+            search_data = _encode_response(resp)
+            print(f"[RESP] {search_tool.name}: {_preview(search_data)}")
         except Exception as e:
             print(f"[ERROR] calling {search_tool.name}: {e}")
     else:
@@ -55,24 +103,18 @@ async def _list_and_sample(toolset: MCPToolset, label: str, query: str) -> None:
     if fetch_tool:
         # Try to find a URL candidate in previous response (very light heuristic)
         url = None
-        try:
-            if 'preview' in locals():
-                # try crude extraction
-                import re
-                m = re.search(r"https?://[\w\-\./%?#=&:]+", preview)
-                if m:
-                    url = m.group(0)
-        except Exception:
-            pass
+        # try crude extraction
+        m = _URL_RE.search(search_data)
+        if m:
+            url = m.group(0).decode("ascii")
         if not url:
             # fallback to a neutral URL
             url = "https://example.com"
         try:
             print(f"[CALL] {fetch_tool.name} -> url='{url}'")
-            args = {k: v for k, v in (('url', url), ('q', url))}  # some servers accept 'q'
-            resp2: Any = await fetch_tool.run_async(args=args)  # type: ignore[attr-defined]
-            text = json.dumps(resp2, ensure_ascii=False) if not isinstance(resp2, str) else resp2
-            print(f"[RESP] {fetch_tool.name}: {text[:600]}{'...<truncated>' if len(text) > 600 else ''}")
+            args = {"url": url, "q": url}  # some servers accept 'q'
+            resp2: Any = await _RUN_CACHE.cached_call(fetch_tool, args)
+            print(f"[RESP] {fetch_tool.name}: {_preview_response(resp2)}")
         except Exception as e:
             print(f"[ERROR] calling {fetch_tool.name}: {e}")
     else:
@@ -7,9 +7,23 @@ MCP utilities for building ADK MCPToolset instances from environment variables.
 """
 from __future__ import annotations
 
+import asyncio
+import atexit
+import contextlib
+import hashlib
+import json
+import logging
+import logging.handlers
 import os
-from typing import Any, List
-import os.path
+import queue
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 try:
     from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset
@@ -22,10 +36,79 @@ except Exception:  # pragma: no cover
     SseConnectionParams = None  # type: ignore
     StreamableHTTPConnectionParams = None  # type: ignore
 
+logger = logging.getLogger("bsj_agent.mcp")
+_debug_listener: Optional[logging.handlers.QueueListener] = None
+_debug_handler: Optional[logging.Handler] = None
+
+
+def _install_debug_handler() -> logging.Handler:
+    """
+    Return the handler that routes this module's debug output to stdout.
+
+    Records go through a QueueHandler and are written by a QueueListener
+    thread, so coroutines logging during concurrent tool setup never block
+    on the stdout lock. Created once; the listener is flushed at exit.
+    """
+    global _debug_listener, _debug_handler
+    if _debug_handler is None:
+        stream = logging.StreamHandler(sys.stdout)
+        stream.setFormatter(logging.Formatter("%(message)s"))
+        q: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        _debug_listener = logging.handlers.QueueListener(q, stream)
+        _debug_listener.start()
+        atexit.register(_debug_listener.stop)
+        _debug_handler = logging.handlers.QueueHandler(q)
+    return _debug_handler
+
+
+# Overlapping debug=True calls (e.g. batch workers) share one enable: the
+# first to enter saves the logger state and the last to leave restores it
+_debug_lock = threading.Lock()
+_debug_depth = 0
+_debug_saved: Tuple[int, bool] = (logging.NOTSET, True)
+
+
+@contextlib.contextmanager
+def _debug_logging(enabled: bool):
+    """
+    Log this module's debug output to stdout for the duration of a
+    debug=True call, then restore the logger so later calls stay quiet.
+    """
+    global _debug_depth, _debug_saved
+    if not enabled:
+        yield
+        return
+    with _debug_lock:
+        if _debug_depth == 0:
+            handler = _install_debug_handler()
+            _debug_saved = (logger.level, logger.propagate)
+            logger.addHandler(handler)
+            logger.setLevel(logging.DEBUG)
+            logger.propagate = False
+        _debug_depth += 1
+    try:
+        yield
+    finally:
+        with _debug_lock:
+            _debug_depth -= 1
+            if _debug_depth == 0:
+                logger.removeHandler(_install_debug_handler())
+                logger.setLevel(_debug_saved[0])
+                logger.propagate = _debug_saved[1]
+
+
+# Optional fast JSON encoder for cache keys; stdlib json otherwise.
+try:
+    import orjson
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
 
 def _normalize_base(url: str) -> str:
-    url = url.strip()
-    return url.rstrip('/')
+    # Fast path: already normalized (the usual case after config is read)
+    if url and not url[0].isspace() and not url[-1].isspace() and url[-1] != '/':
+        return url
+    return url.strip().rstrip('/')
 
 
 def _ensure_sse(url: str) -> str:
@@ -33,69 +116,433 @@ def _ensure_sse(url: str) -> str:
     return base if base.endswith('/sse') else f"{base}/sse"
 
 
-def build_researcher_toolsets(debug: bool = False) -> List[Any]:
+# Keep-alive pool for the MCP transports. MCP opens one HTTP client per
+# session and holds it for the session's life, so with cached toolsets these
+# sockets (and their TLS sessions) serve every tool call of the run.
+_HTTP_LIMITS = {"max_connections": 50, "max_keepalive_connections": 20, "keepalive_expiry": 60.0}
+_HTTP_TIMEOUT = (30.0, 300.0)  # (general, SSE read), the MCP SDK defaults
+
+
+def _pooled_http_client(headers: Dict[str, str] | None = None, timeout: Any = None, auth: Any = None) -> Any:
+    """httpx client factory for MCP connection params, tuned for reuse."""
+    import httpx
+
+    try:
+        import h2  # noqa: F401  (enables HTTP/2 multiplexing when installed)
+        http2 = True
+    except Exception:
+        http2 = False
+    if timeout is None:
+        timeout = httpx.Timeout(_HTTP_TIMEOUT[0], read=_HTTP_TIMEOUT[1])
+    return httpx.AsyncClient(
+        headers=headers,
+        timeout=timeout,
+        auth=auth,
+        limits=httpx.Limits(**_HTTP_LIMITS),
+        http2=http2,
+    )
+
+
+def _http_client_kwargs(params_cls: Any) -> Dict[str, Any]:
+    """
+    Extra kwargs to route an ADK connection-params class through
+    _pooled_http_client. Empty when this ADK has no httpx_client_factory field
+    or its MCP SDK is not built on the `httpx` package, so ADK's default client
+    is used unchanged.
+    """
+    if "httpx_client_factory" not in getattr(params_cls, "model_fields", {}):
+        return {}
+    try:
+        import httpx
+        from mcp.shared import _httpx_utils
+    except Exception:
+        return {}
+    if getattr(_httpx_utils, "httpx", None) is not httpx:
+        return {}
+    return {"httpx_client_factory": _pooled_http_client}
+
+
+def _with_query(url: str, **params: str) -> str:
+    """
+    Set query parameters on `url` that are missing or blank, percent-encoding
+    the values. Parameters that already carry a value are left untouched.
+    """
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query, keep_blank_values=True))
+    missing = {k: v for k, v in params.items() if not query.get(k)}
+    if not missing:
+        return url
+    query.update(missing)
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def _env(name: str, *, expand: bool = True) -> str:
+    """Stripped env var; $VAR references are expanded only when present."""
+    value = os.getenv(name, "").strip()
+    if expand and "$" in value:
+        value = os.path.expandvars(value)
+    return value
+
+
+@dataclass(frozen=True, slots=True)
+class McpEnv:
+    """Snapshot of the researcher MCP settings; hashable, so it keys the cache."""
+    tavily_url: str = ""
+    tavily_key: str = field(default="", repr=False)
+    firecrawl_url: str = ""
+    firecrawl_key: str = field(default="", repr=False)
+
+    @classmethod
+    def from_environ(cls) -> "McpEnv":
+        """Read and normalize the researcher MCP env vars."""
+        return cls(
+            tavily_url=_normalize_base(_env("TAVILY_MCP_URL")),
+            tavily_key=_env("TAVILY_API_KEY", expand=False),
+            firecrawl_url=_env("FIRECRAWL_MCP_URL"),
+            firecrawl_key=_env("FIRECRAWL_API_KEY", expand=False),
+        )
+
+
+# (McpEnv, thread id) -> built toolsets. MCPToolset owns its MCP session, so
+# sharing instances lets every researcher agent reuse the same connections
+# instead of handshaking per agent. Keyed per thread because ADK's session
+# manager closes a pooled session it finds bound to another event loop, even
+# a live one; batch workers each run their own loop and so get their own set.
+_TOOLSETS_CACHE: Dict[Tuple[McpEnv, int], List[Any]] = {}
+
+
+def build_researcher_toolsets(debug: bool = False, *, env: McpEnv | None = None) -> List[Any]:
     """
     Create MCP toolsets for the researcher agent.
 
     Env vars:
       - TAVILY_MCP_URL (+ TAVILY_API_KEY)
       - FIRECRAWL_MCP_URL (+ FIRECRAWL_API_KEY) [SSE]
+
+    Pass `env` to use an explicit McpEnv instead of reading os.environ.
+    Toolsets are cached per McpEnv and calling thread; each call returns a new
+    list holding the shared instances. Use close_researcher_toolsets() to tear them down.
     """
-    toolsets: List[Any] = []
+    with _debug_logging(debug):
+        if MCPToolset is None:
+            logger.debug("[MCP] ADK MCPToolset not available; skipping tool setup")
+            return []
+
+        if env is None:
+            env = McpEnv.from_environ()
+        key = (env, threading.get_ident())
+        toolsets = _TOOLSETS_CACHE.get(key)
+        if toolsets is None:
+            toolsets = _TOOLSETS_CACHE[key] = _build_toolsets(env)
+            _schedule_warm_up(toolsets)
+        else:
+            logger.debug("[MCP] Reusing %d cached researcher toolset(s)", len(toolsets))
+        _log_toolsets(toolsets)
+        return list(toolsets)
+
+
+def _log_toolsets(toolsets: List[Any]) -> None:
+    """Debug-log the toolset count and each connection URL."""
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+    logger.debug("[MCP] researcher_tools count: %d", len(toolsets))
+    for i, t in enumerate(toolsets):
+        try:
+            conn = getattr(t, "connection_params", None)
+            url = getattr(conn, "url", None) if conn else None
+            logger.debug("[MCP] toolset[%d] class=%s url=%s", i, t.__class__.__name__, url)
+        except Exception:
+            pass
+
+
+async def warm_researcher_toolsets(toolsets: Optional[List[Any]] = None) -> None:
+    """
+    Open each toolset's MCP session and prime its tool index ahead of the
+    first real call, taking the initialize handshake off the critical path.
+    Await it on the loop that will use the tools; errors are ignored.
+    """
+    if toolsets is None:
+        toolsets = build_researcher_toolsets()
+    await asyncio.gather(*(get_toolset_index(t) for t in toolsets), return_exceptions=True)
+
+
+# Strong refs so pending warm-up tasks are not garbage collected mid-flight
+_WARM_TASKS: "set[asyncio.Task[Any]]" = set()
+
+
+def _schedule_warm_up(toolsets: List[Any]) -> None:
+    """
+    Start warming fresh toolsets in the background when built from inside a
+    running loop. Sync callers are skipped: an MCP session is bound to the
+    loop that opened it, so warming on another loop would not carry over.
+    """
+    if not toolsets:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    task = loop.create_task(warm_researcher_toolsets(toolsets))
+    _WARM_TASKS.add(task)
+    task.add_done_callback(_WARM_TASKS.discard)
 
-    if MCPToolset is None:
-        if debug:
-            print("[MCP] ADK MCPToolset not available; skipping tool setup")
-        return toolsets
 
-    tavily_url = _normalize_base(os.path.expandvars(os.getenv("TAVILY_MCP_URL", "")))
-    tavily_key = os.getenv("TAVILY_API_KEY", "").strip()
-    firecrawl_url = os.path.expandvars(os.getenv("FIRECRAWL_MCP_URL", "").strip())
-    firecrawl_key = os.getenv("FIRECRAWL_API_KEY", "").strip()
+async def close_researcher_toolsets() -> None:
+    """Close every cached researcher toolset and empty the cache."""
+    toolsets = [t for group in _TOOLSETS_CACHE.values() for t in group]
+    _TOOLSETS_CACHE.clear()
+    for toolset in toolsets:
+        try:
+            await toolset.close()
+        except Exception:
+            pass
+
+
+@atexit.register
+def _close_at_exit() -> None:
+    if not _TOOLSETS_CACHE:
+        return
+    try:
+        asyncio.run(close_researcher_toolsets())
+    except Exception:
+        pass
+
+
+def _build_toolsets(env: McpEnv) -> List[Any]:
+    """Construct the Tavily/Firecrawl toolsets for one env configuration."""
+    toolsets: List[Any] = []
+    tavily_url, tavily_key = env.tavily_url, env.tavily_key
+    firecrawl_url, firecrawl_key = env.firecrawl_url, env.firecrawl_key
 
     # Log detection
-    if debug:
-        print(
-            f"[MCP] Env detected: tavily_url={'set' if tavily_url else 'unset'}, "
-            f"firecrawl_url={'set' if firecrawl_url else 'unset'}"
-        )
+    logger.debug(
+        "[MCP] Env detected: tavily_url=%s, firecrawl_url=%s",
+        "set" if tavily_url else "unset",
+        "set" if firecrawl_url else "unset",
+    )
 
     # Tavily (HTTP streamable)
     if tavily_url and StreamableHTTPConnectionParams is not None:
         # If Tavily expects key via query parameter and it's missing/empty, append or fill it.
         if tavily_key and 'tavily' in tavily_url:
-            if 'tavilyApiKey=' not in tavily_url:
-                sep = '&' if '?' in tavily_url else '?'
-                tavily_url = f"{tavily_url}{sep}tavilyApiKey={tavily_key}"
-            elif tavily_url.endswith('tavilyApiKey='):
-                tavily_url = f"{tavily_url}{tavily_key}"
+            tavily_url = _with_query(tavily_url, tavilyApiKey=tavily_key)
         conn = StreamableHTTPConnectionParams(
             url=tavily_url,
             headers=({"Authorization": f"Bearer {tavily_key}"} if tavily_key else None),
+            **_http_client_kwargs(StreamableHTTPConnectionParams),
         )
         toolsets.append(MCPToolset(connection_params=conn))
-        if debug:
-            print(f"[MCP] Tavily toolset configured url={tavily_url}")
+        logger.debug("[MCP] Tavily toolset configured url=%s", tavily_url)
 
     # Firecrawl (SSE)
+    # No custom SSE reader here: ADK hands the stream to the MCP SDK's
+    # sse_client (httpx + httpx-sse), whose transport already reads the socket
+    # in 64 KiB chunks and splits events in one pass over the decoded text.
+    # ADK exposes no hook to swap that parser, only the client factory above.
     if firecrawl_url and SseConnectionParams is not None:
         url = _ensure_sse(firecrawl_url)
         conn = SseConnectionParams(
             url=url,
             headers=({"Authorization": f"Bearer {firecrawl_key}"} if firecrawl_key else None),
+            **_http_client_kwargs(SseConnectionParams),
         )
         toolsets.append(MCPToolset(connection_params=conn))
-        if debug:
-            print(f"[MCP] Firecrawl toolset configured url={url}")
-
-    if debug:
-        print(f"[MCP] researcher_tools count: {len(toolsets)}")
-        for i, t in enumerate(toolsets):
-            try:
-                conn = getattr(t, "connection_params", None)
-                url = getattr(conn, "url", None) if conn else None
-                print(f"[MCP] toolset[{i}] class={t.__class__.__name__} url={url}")
-            except Exception:
-                pass
+        logger.debug("[MCP] Firecrawl toolset configured url=%s", url)
 
     return toolsets
+
+
+async def batch_execute(
+    calls: Iterable[Tuple[Any, Dict[str, Any]]],
+    max_concurrent: int = 8,
+    stop_on_error: bool = False,
+) -> List[Any]:
+    """
+    Run independent MCP tool calls concurrently.
+
+    `calls` is an iterable of (tool, args) pairs; each is awaited as
+    `tool.run_async(args=args)` with at most `max_concurrent` in flight.
+    Returns one entry per call, in order: the tool response, or the exception
+    it raised. With stop_on_error=True the first failure cancels the calls
+    still pending, which then show up as CancelledError entries.
+    """
+    sem = asyncio.Semaphore(max_concurrent)
+
+    async def _one(tool: Any, args: Dict[str, Any]) -> Any:
+        async with sem:
+            return await tool.run_async(args=args)
+
+    tasks = [asyncio.ensure_future(_one(tool, args)) for tool, args in calls]
+    if not tasks:
+        return []
+    if stop_on_error:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+    return list(await asyncio.gather(*tasks, return_exceptions=True))
+
+
+def mcp_call_sync(tool: Any, args: Dict[str, Any], timeout: float | None = None) -> Any:
+    """
+    Sync facade for `tool.run_async(args=args)`.
+
+    Runs on the shared background loop (tools._loop) rather than a fresh
+    asyncio.run() loop, so the tool's MCP session survives between calls.
+    """
+    from ._loop import get_loop_thread
+
+    return get_loop_thread().run(tool.run_async(args=args), timeout)
+
+
+class ToolRunCache:
+    """
+    TTL + LRU cache of MCP tool responses for read-only tools.
+
+    Only tools whose lower-cased name contains one of `idempotent` are cached,
+    so anything that may mutate remote state always goes to the server.
+    Entries are keyed by a blake2b digest of the tool name and its
+    key-sorted JSON args. Exceptions are never cached.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 300.0,
+        idempotent: Iterable[str] = ("search", "fetch", "scrape"),
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.idempotent = tuple(idempotent)
+        self._entries: "OrderedDict[bytes, Tuple[float, Any]]" = OrderedDict()
+
+    def _cacheable(self, name: str) -> bool:
+        name = name.lower()
+        return any(k in name for k in self.idempotent)
+
+    @staticmethod
+    def _key(name: str, args: Dict[str, Any]) -> bytes:
+        if orjson is not None:
+            blob = orjson.dumps(args, option=orjson.OPT_SORT_KEYS, default=str)
+        else:
+            blob = json.dumps(args, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.blake2b(name.encode("utf-8") + b"\0" + blob, digest_size=16).digest()
+
+    async def cached_call(self, tool: Any, args: Dict[str, Any]) -> Any:
+        """Return `tool.run_async(args=args)`, served from cache when fresh."""
+        name = getattr(tool, "name", "")
+        if not self._cacheable(name):
+            return await tool.run_async(args=args)
+        key = self._key(name, args)
+        hit = self._entries.get(key)
+        now = time.monotonic()
+        if hit is not None:
+            if hit[0] > now:
+                self._entries.move_to_end(key)
+                return hit[1]
+            del self._entries[key]
+        result = await tool.run_async(args=args)
+        self._entries[key] = (now + self.ttl, result)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return result
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+# Name fragments that mark a tool as search-like / fetch-like
+SEARCH_KWS = ("search", "web")
+FETCH_KWS = ("crawl", "fetch", "scrape")
+
+
+class ToolsetIndex:
+    """
+    One toolset's tool catalog, fetched once: the tools in server order, a
+    lower-cased name -> tool map, and the first search-like and fetch-like tool.
+    """
+
+    def __init__(self, tools: list) -> None:
+        self.tools = tools
+        # Lower-case each name once; MCP tool names are unique per server
+        names = [getattr(t, "name", t.__class__.__name__).lower() for t in tools]
+        self.by_name: dict[str, Any] = dict(zip(names, tools))
+        search = fetch = None
+        for n, t in zip(names, tools):
+            if search is None and any(k in n for k in SEARCH_KWS):
+                search = t
+            if fetch is None and any(k in n for k in FETCH_KWS):
+                fetch = t
+            if search is not None and fetch is not None:
+                break
+        self.search: Any = search
+        self.fetch: Any = fetch
+
+
+# Indexes live as long as their toolset; closing/dropping it drops the entry
+_INDEXES: "weakref.WeakKeyDictionary[Any, ToolsetIndex]" = weakref.WeakKeyDictionary()
+
+
+async def get_toolset_index(toolset: Any) -> ToolsetIndex:
+    """Return the cached tool index for `toolset`, listing tools on first use."""
+    index = _INDEXES.get(toolset)
+    if index is None:
+        index = _INDEXES[toolset] = ToolsetIndex(await toolset.get_tools())
+    return index
+
+
+class _BudgetSpent(Exception):
+    pass
+
+
+def truncating_repr(obj: Any, budget: int = 600, suffix: str = "...") -> Tuple[str, bool]:
+    """
+    JSON-style preview of `obj` that stops after `budget` characters.
+
+    Walks dicts/lists depth-first and emits pieces until the budget runs out,
+    so a multi-megabyte tool response costs only as much work as the preview
+    shows. Returns (preview, was_truncated); a truncated preview ends in `suffix`.
+    """
+    out: List[str] = []
+    left = budget
+
+    def emit(piece: str) -> None:
+        nonlocal left
+        if len(piece) > left:
+            out.append(piece[:left])
+            left = 0
+            raise _BudgetSpent
+        out.append(piece)
+        left -= len(piece)
+
+    def scalar(value: Any) -> str:
+        if isinstance(value, str):
+            # Only escape what could still be shown
+            return json.dumps(value[: left + 1], ensure_ascii=False)
+        try:
+            return json.dumps(value)
+        except (TypeError, ValueError):
+            return repr(value)
+
+    def walk(value: Any) -> None:
+        if isinstance(value, dict):
+            emit("{")
+            for i, (k, v) in enumerate(value.items()):
+                emit(", " if i else "")
+                emit(scalar(str(k)) + ": ")
+                walk(v)
+            emit("}")
+        elif isinstance(value, (list, tuple)):
+            emit("[")
+            for i, v in enumerate(value):
+                emit(", " if i else "")
+                walk(v)
+            emit("]")
+        else:
+            emit(scalar(value))
+
+    try:
+        walk(obj)
+    except _BudgetSpent:
+        return "".join(out) + suffix, True
+    return "".join(out), False
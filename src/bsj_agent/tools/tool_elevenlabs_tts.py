@@ -7,5 +7,10 @@ def tool_elevenlabs_tts(text: str, voice_id: Optional[str] = None) -> bytes:
     Replace with real ElevenLabs API integration and auth handling.
     """
     print("[WARN] tool_elevenlabs_tts is a stub. No real audio generated.")
-    payload = f"VOICE:{voice_id or 'default'}\n{text}".encode("utf-8")
-    return payload
+    # Encode the header and text separately into one buffer, skipping the
+    # concatenated intermediate str a formatted .encode() would build.
+    buf = bytearray(b"VOICE:")
+    buf += (voice_id or "default").encode("utf-8")
+    buf += b"\n"
+    buf += text.encode("utf-8")
+    return bytes(buf)
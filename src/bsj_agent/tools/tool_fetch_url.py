@@ -1,6 +1,14 @@
 from typing import Any, Dict
 
-import textwrap
+# Placeholder page returned by the stub; formatted with the requested url.
+_HTML_TEMPLATE = (
+    "<html>\n"
+    "  <head><title>Stub fetch for {url}</title></head>\n"
+    "  <body>\n"
+    "    <p>This is placeholder content. Integrate a real fetcher.</p>\n"
+    "  </body>\n"
+    "</html>"
+)
 
 
 def tool_fetch_url(url: str) -> Dict[str, Any]:
@@ -11,14 +19,5 @@ def tool_fetch_url(url: str) -> Dict[str, Any]:
     return {
         "url": url,
         "status": 200,
-        "content": textwrap.dedent(
-            f"""
-            <html>
-              <head><title>Stub fetch for {url}</title></head>
-              <body>
-                <p>This is placeholder content. Integrate a real fetcher.</p>
-              </body>
-            </html>
-            """
-        ).strip(),
+        "content": _HTML_TEMPLATE.format(url=url),
     }
@@ -1,4 +1,5 @@
-from typing import Any, Dict, List
+import json
+from typing import Any, Dict, List, Sequence
 
 try:
     # Placeholder: adapt to ADK tool interface when wiring real search
@@ -17,3 +18,64 @@ def tool_web_search(query: str, k: int = 5) -> List[Dict[str, Any]]:
         {"title": f"Result {i+1} for {query}", "url": f"https://example.com/{i+1}", "snippet": "..."}
         for i in range(k)
     ]
+
+
+async def tool_web_search_batch(queries: Sequence[str], k: int = 5) -> List[List[Dict[str, Any]]]:
+    """
+    Search many queries at once through the researcher's MCP search tool.
+
+    All queries go out concurrently over the cached toolset (one round of
+    gather instead of one round trip per query). Returns one list of
+    {title, url, snippet} dicts per query, in order; a failed query yields [].
+    Falls back to the tool_web_search stub when no MCP search tool is set up.
+    """
+    search_tool = await _find_search_tool()
+    if search_tool is None:
+        return [tool_web_search(q, k=k) for q in queries]
+
+    from .mcp_utils import batch_execute
+
+    responses = await batch_execute(
+        (search_tool, {"query": q, "max_results": k}) for q in queries
+    )
+    return [[] if isinstance(r, BaseException) else _to_results(r, k) for r in responses]
+
+
+async def _find_search_tool() -> Any:
+    """First search-like tool across the cached researcher toolsets, or None."""
+    from .mcp_utils import build_researcher_toolsets, get_toolset_index
+
+    for toolset in build_researcher_toolsets():
+        try:
+            index = await get_toolset_index(toolset)
+        except Exception:
+            continue
+        if index.search is not None:
+            return index.search
+    return None
+
+
+def _to_results(resp: Any, k: int) -> List[Dict[str, Any]]:
+    """Normalize an MCP search response to at most `k` {title, url, snippet} dicts."""
+    if isinstance(resp, dict) and "results" not in resp:
+        # MCP CallToolResult shape: JSON payload in the first text content part
+        for part in resp.get("content") or ():
+            text = part.get("text") if isinstance(part, dict) else None
+            if text:
+                try:
+                    resp = json.loads(text)
+                except ValueError:
+                    return [{"title": "", "url": "", "snippet": text}]
+                break
+    results = resp.get("results") if isinstance(resp, dict) else resp
+    if not isinstance(results, list):
+        return []
+    return [
+        {
+            "title": r.get("title", ""),
+            "url": r.get("url", ""),
+            "snippet": r.get("content") or r.get("snippet", ""),
+        }
+        for r in results[:k]
+        if isinstance(r, dict)
+    ]
@@ -1,32 +1,14 @@
 from __future__ import annotations
 
-import os
-from typing import Any, Dict
-
-# ADK imports for the async-first agent runner path. We orchestrate them
-# synchronously by using InMemoryRunner which exposes a sync .run() wrapper.
-try:
-    from google.adk.agents import LlmAgent
-    from google.adk.agents import SequentialAgent, ParallelAgent
-    from google.adk.runners import InMemoryRunner
-    from google.genai import types
-    # MCP tooling (optional): used to connect Tavily/Firecrawl MCP servers
-    from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset
-    from google.adk.tools.mcp_tool.mcp_session_manager import (
-        SseConnectionParams,
-        StreamableHTTPConnectionParams,
-    )
-except Exception:
-    # Keep local stubs usable even if ADK is not installed; the ADK path will
-    # be guarded when invoked.
-    LlmAgent = None  # type: ignore
-    SequentialAgent = None  # type: ignore
-    ParallelAgent = None  # type: ignore
-    InMemoryRunner = None  # type: ignore
-    types = None  # type: ignore
-    MCPToolset = None  # type: ignore
-    SseConnectionParams = None  # type: ignore
-    StreamableHTTPConnectionParams = None  # type: ignore
+import asyncio
+import contextlib
+import functools
+import hashlib
+import json
+import re
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional
 
 from .agents import (
     bsj_researcher,
@@ -35,6 +17,50 @@ from .agents import (
     bsj_captioner,
     bsj_voiceover,
 )
+from . import checkpoints, stage_cache
+from .agents._adk import json_config
+from .session import SessionState
+
+# Optional fast JSON codec for parsing model output; stdlib json otherwise.
+try:
+    import orjson
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# ADK symbols for the async-first agent runner path. Stages run through one
+# shared InMemorySessionService and a Runner per agent (see `_stage_runner`).
+# They are imported on first use by `_load_adk` so the stub engine never pays
+# the google-adk import cost; until then (or if ADK is missing) they are None.
+LlmAgent = None  # type: ignore
+SequentialAgent = None  # type: ignore
+ParallelAgent = None  # type: ignore
+InMemoryRunner = None  # type: ignore
+Runner = None  # type: ignore
+InMemorySessionService = None  # type: ignore
+types = None  # type: ignore
+_ADK_LOADED = False
+
+
+def _load_adk() -> None:
+    """Import ADK once and bind its symbols as module globals."""
+    global LlmAgent, SequentialAgent, ParallelAgent, InMemoryRunner, Runner, InMemorySessionService, types
+    global _ADK_LOADED
+    if _ADK_LOADED:
+        return
+    _ADK_LOADED = True
+    try:
+        from google.adk.agents import LlmAgent
+        from google.adk.agents import SequentialAgent, ParallelAgent
+        from google.adk.runners import InMemoryRunner, Runner
+        from google.adk.sessions import InMemorySessionService
+        from google.genai import types
+    except Exception:
+        # Keep local stubs usable even if ADK is not installed; the ADK path
+        # is guarded when invoked.
+        LlmAgent = SequentialAgent = ParallelAgent = InMemoryRunner = Runner = InMemorySessionService = types = None
+        return
 
 
 # Debug helpers to trace tool usage in researcher stages
@@ -63,6 +89,7 @@ def build_bsj_adk_agent(*, include_newsletter: bool = False, debug: bool = False
     Build the BSJ pipeline using per-agent factories, composed with ADK-native
     SequentialAgent and ParallelAgent. This constructs the graph only.
     """
+    _load_adk()
     if SequentialAgent is None or ParallelAgent is None:
         raise RuntimeError("ADK not available. Install google-adk and retry.")
 
@@ -79,12 +106,14 @@ def build_bsj_adk_agent(*, include_newsletter: bool = False, debug: bool = False
     captioner = create_captioner()
     voiceover = create_voiceover()
 
+    # Voiceover reads only the script, so it fans out with the other assets
+    # (as in _adk_run_branches)
     assets_parallel = ParallelAgent(
         name="bsj_assets_parallel",
-        sub_agents=[thumbnail_promptor, captioner],
+        sub_agents=[thumbnail_promptor, captioner, voiceover],
     )
 
-    sub_agents = [researcher, scriptwriter, assets_parallel, voiceover]
+    sub_agents = [researcher, scriptwriter, assets_parallel]
 
     # Optional newsletter can be added later as its own package
     if include_newsletter:
@@ -102,7 +131,8 @@ class BsjPipeline:
     Minimal synchronous orchestration matching the charter:
     researcher -> review -> scriptwriter -> review -> (thumbnail + captioner) -> voiceover -> (optional) newsletter
 
-    session structure is a dict with a "state" key used by each stage.
+    Stages share a typed SessionState; run() returns the usual session dict
+    with "state" and "meta" keys.
     """
 
     # Initialize the BSJ pipeline orchestrator
@@ -117,393 +147,676 @@ class BsjPipeline:
 
     # Run the BSJ pipeline
     def run(self, topic: str) -> Dict[str, Any]:
-        session: Dict[str, Any] = {"state": {"topic": topic}}
+        state = SessionState(topic=topic)
+        meta: Dict[str, Any] = {}
 
         # Research
-        session = self.researcher.run(session)
-        self._human_review(session, stage="research")
+        state = self.researcher.run(state)
+        self._human_review(meta, stage="research")
 
         # Scriptwriting
-        session = self.scriptwriter.run(session)
-        self._human_review(session, stage="script")
+        state = self.scriptwriter.run(state)
+        self._human_review(meta, stage="script")
 
         # Parallel branch (serialized here)
-        session = self.thumbnail_promptor.run(session)
-        session = self.captioner.run(session)
+        state = self.thumbnail_promptor.run(state)
+        state = self.captioner.run(state)
 
         # Voiceover
-        session = self.voiceover.run(session)
+        state = self.voiceover.run(state)
 
         # Optional newsletter (not implemented in simple pipeline; use ADK path below)
         # if self.include_newsletter:
-        #     session = self.newsletter_rewriter.run(session)
+        #     state = self.newsletter_rewriter.run(state)
 
-        return session
+        # Plain-dict session at the boundary, consistent with the ADK paths
+        return {"state": state.to_dict(), "meta": meta}
 
-    def _human_review(self, session: Dict[str, Any], stage: str) -> None:
+    def _human_review(self, meta: Dict[str, Any], stage: str) -> None:
         """
         Placeholder human review gate. In production, wire to UI/CLI confirmation.
         """
-        session.setdefault("meta", {}).setdefault("reviews", []).append({
+        meta.setdefault("reviews", []).append({
             "stage": stage,
             "status": "auto-approved (stub)",
         })
 
 
 # === ADK Orchestration (Pattern A: Python sequencing) ===
-def run_adk_pipeline(topic: str, include_newsletter: bool = False, *, debug: bool = False) -> tuple[Dict[str, Any] | None, str | None]:
+# Identical opening for every stage instruction. Gemini's implicit prompt
+# caching matches on a shared prefix, so stage text goes after it. It is
+# also prepended to the tool-using researcher stages, so it must not forbid
+# tool calls or outside data; it only constrains the final answer.
+_COMMON_PREAMBLE = (
+    "You are one stage of the BSJ content pipeline. Your inputs are in session.state.\n"
+    "Your final answer must be ONLY valid JSON (no markdown, no code fences, no prose outside JSON).\n"
+    "Stay STRICTLY on session.state.topic; never drift into unrelated domains.\n\n"
+)
+
+# Static stage definitions for run_adk_pipeline:
+# agent name -> (model, description, instruction, output_key)
+_STAGE_SPECS: dict[str, tuple[str, str, str, str]] = {
+    "bsj_researcher": (
+        "gemini-2.5-pro",
+        "Research subtopics, key stats, and citations for the BSJ topic.",
+        "You are the BSJ researcher. Read session.state.topic and stay STRICTLY on that topic.\n"
+        "Use tools FIRST: perform SEARCH using a tool whose name contains 'search' or 'web'; then FETCH full content using a tool whose name contains 'crawl' or 'fetch'. (Examples: Tavily via MCP, Firecrawl via MCP.)\n"
+        "Do not answer until you have used at least one search tool and one fetch/crawl tool. If tools are unavailable, return {\"research\": {\"topics\": [], \"key_stats\": [], \"citations\": []}, \"error\": \"TOOLS_UNAVAILABLE\"}.\n"
+        "Style: Plan -> Tool calls -> Synthesis -> JSON only.\n"
+        "Example (abbrev.): Plan: search 'AI Africa fintech inclusion' -> fetch top 3 result URLs -> extract stats -> output JSON.\n"
+        "Synthesize facts and key stats ONLY from fetched content.\n"
+        "Respond with ONLY valid JSON (no markdown) as {\"research\": {\"topics\": [], \"key_stats\": [], \"citations\": [{\"title\": \"...\", \"url\": \"...\"}]}}.\n"
+        "Provide at least 3 citations with accurate titles and URLs. Avoid unrelated domains; remain on session.state.topic.",
+        "research",
+    ),
+    "bsj_researcher_repair": (
+        "gemini-2.5-pro",
+        "Repair research to required schema using search+fetch tools.",
+        "You must use tools in this order: 1) SEARCH using a tool with name containing 'search' or 'web'; 2) FETCH full pages using a tool with name containing 'crawl' or 'fetch'; then synthesize from fetched text only.\n"
+        "Style: Plan -> Tool calls -> Synthesis -> JSON only. Example: search 'AI Africa fintech' -> fetch 3 URLs -> extract numeric stats -> output JSON.\n"
+        "Do not answer until at least one search and one fetch/crawl tool have been used; otherwise return an empty research object plus error=TOOLS_UNAVAILABLE.\n"
+        "Respond ONLY with JSON (no markdown) as {\"research\": {\"topics\":[5-8 short strings], \"key_stats\":[5-8 concise facts with numbers], \"citations\":[{\"title\":\"...\",\"url\":\"...\"}]}}.\n"
+        "Provide >=3 citations with accurate titles and working URLs. Stay strictly on session.state.topic.",
+        "research",
+    ),
+    "bsj_scriptwriter": (
+        "gemini-2.5-flash",
+        "Transform research into a narrative script.",
+        "You are the BSJ scriptwriter. Use session.state.research.topics and session.state.research.key_stats to craft a BSJ-tone narrative.\n"
+        "Respond with ONLY valid JSON (no markdown, no code fences, no prose).\n"
+        "- beats: array of 5-8 short strings capturing the narrative beats\n"
+        "- draft: a single string, 400-700 words, culturally grounded in BSJ voice\n"
+        "- summary: a single string <= 60 words\n"
+        "Output the object as {\"script\": { ... }}. Stay STRICTLY on session.state.topic. Do NOT mention unrelated domains (e.g., sports, specific teams).",
+        "script",
+    ),
+    "bsj_scriptwriter_repair": (
+        "gemini-2.5-flash",
+        "Repair and complete script to required schema.",
+        "Your previous output did not satisfy the schema. Using session.state.research.topics and key_stats, "
+        "respond with ONLY JSON (no markdown). Output exactly: {\"script\": {\"beats\": [5-8 strings], "
+        "\"draft\": string 400-700 words, \"summary\": string <= 60 words}}.",
+        "script",
+    ),
+    "bsj_scriptwriter_on_topic": (
+        "gemini-2.5-flash",
+        "Ensure script aligns to topic and research.",
+        "You must write ONLY JSON as {\"script\": {\"beats\":[], \"draft\": \"...\", \"summary\": \"...\"}}.\n"
+        "Stay STRICTLY on session.state.topic. Use at least 3 phrases from session.state.research.topics and reflect key_stats where natural.\n"
+        "Do not mention unrelated domains (e.g., sports if topic is fashion).",
+        "script",
+    ),
+    "bsj_thumbnail_promptor": (
+        "gemini-2.5-flash",
+        "Generate 3 Afrofuturist-style thumbnail prompts.",
+        "Read session.state.script.summary. Output JSON under 'thumbnail_prompts' as an array of 3 strings. "
+        "No prose outside JSON.",
+        "thumbnail_prompts",
+    ),
+    "bsj_captioner": (
+        "gemini-2.5-flash",
+        "Generate captions and hashtags for YouTube, TikTok, and Instagram.",
+        "Read session.state.script.summary and session.state.topic. Output ONLY JSON under 'captions' with keys youtube[], tiktok[], instagram[], hashtags[]. "
+        "All content must stay on the given topic. No prose outside JSON. Provide at least 2 items for youtube, tiktok, instagram, and at least 8 hashtags.",
+        "captions",
+    ),
+    "bsj_captioner_retry": (
+        "gemini-2.5-flash",
+        "Fill captions with topic-grounded content.",
+        "Respond with ONLY JSON under 'captions' containing non-empty arrays with at least 2 youtube, 2 tiktok, 2 instagram items, and >=8 hashtags.\n"
+        "Each item must clearly refer to session.state.topic and reflect session.state.script.summary. Avoid generic filler.",
+        "captions",
+    ),
+    "bsj_voiceover": (
+        "gemini-2.5-flash",
+        "Transform script into voiceover-ready text.",
+        "Read session.state.script.draft and session.state.topic. Output ONLY JSON under 'voiceover' with key 'text' containing finalized, on-topic narration.\n"
+        "Explicitly reflect at least 2 ideas from session.state.research.topics.",
+        "voiceover",
+    ),
+    "bsj_voiceover_retry": (
+        "gemini-2.5-flash",
+        "Rewrite voiceover on-topic.",
+        "Respond with ONLY JSON as {\"voiceover\": {\"text\": \"...\"}}.\n"
+        "Stay strictly on session.state.topic, and reference at least 2 phrases from session.state.research.topics in natural language.",
+        "voiceover",
+    ),
+    "bsj_newsletter_rewriter": (
+        "gemini-2.5-flash",
+        "Rewrite for newsletter and subject lines.",
+        "Read session.state.script and session.state.research. Output JSON under 'newsletter' with keys 'body' and 'subjects'[3].",
+        "newsletter",
+    ),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _stage_schemas() -> Dict[str, Any]:
+    """
+    Pydantic output schemas for the tool-less stages, by output_key (retry
+    variants share them). Each wraps the value as {output_key: ...}, the shape
+    every stage instruction asks for. Built on first use so importing this
+    module stays free of pydantic.
+    """
+    from pydantic import BaseModel, create_model
+
+    class Script(BaseModel):
+        beats: list[str]
+        draft: str
+        summary: str
+
+    class Captions(BaseModel):
+        youtube: list[str]
+        tiktok: list[str]
+        instagram: list[str]
+        hashtags: list[str]
+
+    class Voiceover(BaseModel):
+        text: str
+
+    class Newsletter(BaseModel):
+        body: str
+        subjects: list[str]
+
+    values: Dict[str, Any] = {
+        "script": Script,
+        "thumbnail_prompts": list[str],
+        "captions": Captions,
+        "voiceover": Voiceover,
+        "newsletter": Newsletter,
+    }
+    return {
+        key: create_model(f"{key.title().replace('_', '')}Output", **{key: (value, ...)})
+        for key, value in values.items()
+    }
+
+
+def _build_stage_agent(name: str, *, tools: Optional[list[Any]] = None, **kwargs: Any) -> Any:
+    """
+    Construct the LlmAgent for a `_STAGE_SPECS` entry. Tool-less stages ask
+    Gemini for application/json constrained by their `_stage_schemas` entry
+    (passed as output_schema, the only way ADK takes a response schema), so
+    the first answer parses without fences or prose; Gemini rejects that mime
+    type alongside function calling, so agents with tools keep free-form output.
+    """
+    model, description, instruction, output_key = _STAGE_SPECS[name]
+    if not tools:
+        kwargs.setdefault("generate_content_config", json_config())
+        schema = _stage_schemas().get(output_key)
+        if schema is not None:
+            kwargs.setdefault("output_schema", schema)
+    return LlmAgent(
+        name=name,
+        model=model,
+        description=description,
+        instruction=_COMMON_PREAMBLE + instruction,
+        output_key=output_key,
+        tools=tools if tools is not None else [],
+        **kwargs,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _stage_agent(name: str) -> Any:
+    """
+    Tool-less stage agent, built once per process. Agents hold no per-run
+    state (that lives in the session), and the runner never parents them, so
+    one instance can serve every run. Call after `_load_adk()`.
+    """
+    return _build_stage_agent(name)
+
+
+def run_adk_pipeline(
+    topic: str,
+    include_newsletter: bool = False,
+    *,
+    debug: bool = False,
+    reviewer: Optional[Reviewer] = None,
+    resume: bool = False,
+) -> tuple[Dict[str, Any] | None, str | None]:
     """
     Execute the BSJ pipeline using ADK `LlmAgent`s for each stage and route
     outputs to `session.state` using `output_key`.
 
     Returns (session_state_dict, error_message).
 
+    `reviewer(stage, state)` is an optional async human-review gate awaited
+    after the research and script stages. While it is pending, the next stage
+    already runs speculatively; a False verdict cancels that work and returns
+    the state reached so far with an error. Without a reviewer, the script
+    gets the usual auto-approved review entry.
+
+    With BSJ_CHECKPOINTS=1 the state is checkpointed after each phase
+    (research, script, media, newsletter); `resume=True` skips the phases an
+    earlier run of the same topic already completed.
+
     Design:
-    - We create a fresh InMemoryRunner per stage but carry forward the entire
-      session.state by pre-creating the session with the previous state's dict.
-      This avoids needing a custom shared session service instance.
+    - All stages share one InMemorySessionService and each agent keeps its
+      Runner; every stage gets its own session pre-created with the previous
+      state's dict, so the entire session.state is carried forward.
     - Each agent reads from expected keys in state, and writes exactly one key
       via `output_key`.
     - After each stage we read back the session state and pass it forward.
 
-    Note: The ADK agents are async-first; InMemoryRunner provides a sync facade.
+    Note: The ADK agents are async-first; each stage is driven with asyncio.run.
     """
-    if LlmAgent is None or InMemoryRunner is None or types is None:
+    _load_adk()
+    if LlmAgent is None or Runner is None or InMemorySessionService is None or types is None:
         return None, "ADK not available (imports failed). Install google-adk."
 
-    # Short run identifier derived from topic to make logs easy to correlate
-    run_id = hex(abs(hash(("bsj", topic))) % (1 << 32))[2:]
+    # Short run identifier derived from topic to make logs easy to correlate;
+    # blake2b keeps it stable across processes (str hash() is salted per process)
+    run_id = hashlib.blake2b(topic.encode("utf-8"), digest_size=6).hexdigest()
     if debug:
         print(f"[RUN {run_id}] topic={topic}")
 
-    # Optionally construct MCP toolsets for researcher stage (Tavily search + Firecrawl fetch)
+    # MCP toolsets for the researcher stage (Tavily search + Firecrawl fetch),
+    # shared across this thread's runs through mcp_utils' cache (which logs the
+    # toolset count and URLs when debug=True)
     researcher_tools: list[Any] = []
     try:
-        if MCPToolset is not None and (SseConnectionParams is not None or StreamableHTTPConnectionParams is not None):
-            tavily_url = os.getenv("TAVILY_MCP_URL", "").strip()
-            tavily_key = os.getenv("TAVILY_API_KEY", "").strip()
-            firecrawl_url = os.getenv("FIRECRAWL_MCP_URL", "").strip()
-            firecrawl_key = os.getenv("FIRECRAWL_API_KEY", "").strip()
-            if debug:
-                print(
-                    f"[MCP] Env detected: tavily_url={'set' if tavily_url else 'unset'}, firecrawl_url={'set' if firecrawl_url else 'unset'}"
-                )
+        from .tools.mcp_utils import build_researcher_toolsets
 
-            # Tavily: prefer Streamable HTTP client when URL is HTTPS without explicit /sse
-            if tavily_url:
-                try:
-                    conn = StreamableHTTPConnectionParams(url=tavily_url, headers=(
-                        {"Authorization": f"Bearer {tavily_key}"} if tavily_key else None
-                    ))
-                    researcher_tools.append(MCPToolset(connection_params=conn))
-                    if debug:
-                        print("[MCP] Tavily toolset configured")
-                except Exception as e:
-                    if debug:
-                        print(f"[MCP] Tavily toolset error: {e}")
-
-            # Firecrawl typically exposes SSE endpoint
-            if firecrawl_url:
-                try:
-                    conn = SseConnectionParams(url=firecrawl_url, headers=(
-                        {"Authorization": f"Bearer {firecrawl_key}"} if firecrawl_key else None
-                    ))
-                    researcher_tools.append(MCPToolset(connection_params=conn))
-                    if debug:
-                        print("[MCP] Firecrawl toolset configured")
-                except Exception as e:
-                    if debug:
-                        print(f"[MCP] Firecrawl toolset error: {e}")
+        researcher_tools = build_researcher_toolsets(debug=debug)
     except Exception as e:
         if debug:
             print(f"[MCP] Toolset setup failed: {e}")
-    if debug:
-        try:
-            print(f"[MCP] researcher_tools count: {len(researcher_tools)}")
-            for i, t in enumerate(researcher_tools):
-                try:
-                    # Best effort to print connection URL for MCPToolset
-                    conn = getattr(t, 'connection_params', None)
-                    url = getattr(conn, 'url', None) if conn else None
-                    print(f"[MCP] toolset[{i}] class={t.__class__.__name__} url={url}")
-                except Exception:
-                    pass
-        except Exception:
-            pass
-
-    # 1) Researcher — reads topic, writes research
-    researcher = LlmAgent(
-        name="bsj_researcher",
-        model="gemini-2.5-pro",
-        description="Research subtopics, key stats, and citations for the BSJ topic.",
-        instruction=(
-            "You are the BSJ researcher. Read session.state.topic and stay STRICTLY on that topic.\n"
-            "Use tools FIRST: perform SEARCH using a tool whose name contains 'search' or 'web'; then FETCH full content using a tool whose name contains 'crawl' or 'fetch'. (Examples: Tavily via MCP, Firecrawl via MCP.)\n"
-            "Do not answer until you have used at least one search tool and one fetch/crawl tool. If tools are unavailable, return {\"research\": {\"topics\": [], \"key_stats\": [], \"citations\": []}, \"error\": \"TOOLS_UNAVAILABLE\"}.\n"
-            "Style: Plan -> Tool calls -> Synthesis -> JSON only.\n"
-            "Example (abbrev.): Plan: search 'AI Africa fintech inclusion' -> fetch top 3 result URLs -> extract stats -> output JSON.\n"
-            "Synthesize facts and key stats ONLY from fetched content.\n"
-            "Respond with ONLY valid JSON (no markdown) as {\"research\": {\"topics\": [], \"key_stats\": [], \"citations\": [{\"title\": \"...\", \"url\": \"...\"}]}}.\n"
-            "Provide at least 3 citations with accurate titles and URLs. Avoid unrelated domains; remain on session.state.topic."
-        ),
-        output_key="research",
-        tools=researcher_tools,
-        before_tool_callback=_debug_before_tool if debug else None,
-        after_tool_callback=_debug_after_tool if debug else None,
-    )
 
+    # Resume after the furthest phase an earlier run of this topic checkpointed
     state: Dict[str, Any] = {"topic": topic}
-    if debug:
-        print(f"[START:bsj_researcher] run={run_id}")
-    state = _adk_run_single_stage(agent=researcher, state=state, expected_key="research", debug=debug, run_id=run_id)
-    _validate_stage_output(state, key="research", expected_type=dict)
-    # Retry researcher if empty/minimal content
-    try:
-        r = state.get("research", {}) if isinstance(state.get("research"), dict) else {}
-        topics = r.get("topics", []) if isinstance(r, dict) else []
-        key_stats = r.get("key_stats", []) if isinstance(r, dict) else []
-        citations = r.get("citations", []) if isinstance(r, dict) else []
-        needs_retry = (
-            not isinstance(topics, list) or len(topics) < 3 or
-            not isinstance(key_stats, list) or len(key_stats) < 3 or
-            not isinstance(citations, list) or len(citations) < 3
-        )
-        if needs_retry:
+    done = 0
+    if resume:
+        restored = checkpoints.load_latest(run_id, _PHASES)
+        if restored is not None:
+            phase, state = restored
+            done = _PHASES.index(phase) + 1
             if debug:
-                print("[RETRY:bsj_researcher] Detected empty or insufficient research. Retrying with strict schema and tool usage.")
-            researcher_repair = LlmAgent(
-                name="bsj_researcher_repair",
-                model="gemini-2.5-pro",
-                description="Repair research to required schema using search+fetch tools.",
-                instruction=(
-                    "You must use tools in this order: 1) SEARCH using a tool with name containing 'search' or 'web'; 2) FETCH full pages using a tool with name containing 'crawl' or 'fetch'; then synthesize from fetched text only.\n"
-                    "Style: Plan -> Tool calls -> Synthesis -> JSON only. Example: search 'AI Africa fintech' -> fetch 3 URLs -> extract numeric stats -> output JSON.\n"
-                    "Do not answer until at least one search and one fetch/crawl tool have been used; otherwise return an empty research object plus error=TOOLS_UNAVAILABLE.\n"
-                    "Respond ONLY with JSON (no markdown) as {\"research\": {\"topics\":[5-8 short strings], \"key_stats\":[5-8 concise facts with numbers], \"citations\":[{\"title\":\"...\",\"url\":\"...\"}]}}.\n"
-                    "Provide >=3 citations with accurate titles and working URLs. Stay strictly on session.state.topic."
-                ),
-                output_key="research",
-                tools=researcher_tools,
-                before_tool_callback=_debug_before_tool if debug else None,
-                after_tool_callback=_debug_after_tool if debug else None,
+                print(f"[RESUME {run_id}] continuing after checkpointed phase '{phase}'")
+
+    if done < 1:
+        # 1) Researcher — reads topic, writes research. Built per run (not via
+        # _stage_agent) because it carries this run's toolsets and debug callbacks.
+        researcher = _build_stage_agent(
+            "bsj_researcher",
+            tools=researcher_tools,
+            before_tool_callback=_debug_before_tool if debug else None,
+            after_tool_callback=_debug_after_tool if debug else None,
+        )
+        if debug:
+            print(f"[START:bsj_researcher] run={run_id}")
+        state = _adk_run_single_stage(agent=researcher, state=state, expected_key="research", debug=debug, run_id=run_id)
+        _validate_stage_output(state, key="research", expected_type=dict)
+        # Retry researcher if empty/minimal content
+        try:
+            r = state.get("research")
+            if not isinstance(r, dict):
+                r = {}
+            topics = r.get("topics", [])
+            key_stats = r.get("key_stats", [])
+            citations = r.get("citations", [])
+            needs_retry = (
+                not isinstance(topics, list) or len(topics) < 3 or
+                not isinstance(key_stats, list) or len(key_stats) < 3 or
+                not isinstance(citations, list) or len(citations) < 3
             )
+            if needs_retry:
+                if debug:
+                    print("[RETRY:bsj_researcher] Detected empty or insufficient research. Retrying with strict schema and tool usage.")
+                researcher_repair = _build_stage_agent(
+                    "bsj_researcher_repair",
+                    tools=researcher_tools,
+                    before_tool_callback=_debug_before_tool if debug else None,
+                    after_tool_callback=_debug_after_tool if debug else None,
+                )
+                if debug:
+                    print(f"[START:bsj_researcher_repair] run={run_id}")
+                state = _adk_run_single_stage(agent=researcher_repair, state=state, expected_key="research", debug=debug, run_id=run_id)
+                _validate_stage_output(state, key="research", expected_type=dict)
+        except Exception as e:
             if debug:
-                print(f"[START:bsj_researcher_repair] run={run_id}")
-            state = _adk_run_single_stage(agent=researcher_repair, state=state, expected_key="research", debug=debug, run_id=run_id)
-            _validate_stage_output(state, key="research", expected_type=dict)
-    except Exception as e:
-        if debug:
-            print(f"[RETRY:bsj_researcher] check error: {e}")
-
-    # 2) Scriptwriter — reads research, writes script
-    scriptwriter = LlmAgent(
-        name="bsj_scriptwriter",
-        model="gemini-2.5-flash",
-        description="Transform research into a narrative script.",
-        instruction=(
-            "You are the BSJ scriptwriter. Use session.state.research.topics and session.state.research.key_stats to craft a BSJ-tone narrative.\n"
-            "Respond with ONLY valid JSON (no markdown, no code fences, no prose).\n"
-            "- beats: array of 5-8 short strings capturing the narrative beats\n"
-            "- draft: a single string, 400-700 words, culturally grounded in BSJ voice\n"
-            "- summary: a single string <= 60 words\n"
-            "Output the object as {\"script\": { ... }}. Stay STRICTLY on session.state.topic. Do NOT mention unrelated domains (e.g., sports, specific teams)."
-        ),
-        output_key="script",
-        tools=[],
-    )
-    if debug:
-        print(f"[START:bsj_scriptwriter] run={run_id}")
-    state = _adk_run_single_stage(agent=scriptwriter, state=state, expected_key="script", debug=debug, run_id=run_id)
-    _validate_stage_output(state, key="script", expected_type=dict)
-    # One-time retry if empty/invalid content
-    if _script_is_empty(state.get("script", {})):
+                print(f"[RETRY:bsj_researcher] check error: {e}")
+        checkpoints.save(run_id, "research", state)
+
+    if done < 2:
+        # 2) Scriptwriter — reads research, writes script. With a reviewer it runs
+        # speculatively while the research is under review.
+        scriptwriter = _stage_agent("bsj_scriptwriter")
         if debug:
-            print("[RETRY:bsj_scriptwriter] Detected empty script fields. Retrying with stricter format reminder.")
-        scriptwriter_repair = LlmAgent(
-            name="bsj_scriptwriter_repair",
-            model="gemini-2.5-flash",
-            description="Repair and complete script to required schema.",
-            instruction=(
-                "Your previous output did not satisfy the schema. Using session.state.research.topics and key_stats, "
-                "respond with ONLY JSON (no markdown). Output exactly: {\"script\": {\"beats\": [5-8 strings], "
-                "\"draft\": string 400-700 words, \"summary\": string <= 60 words}}."
-            ),
-            output_key="script",
-            tools=[],
+            print(f"[START:bsj_scriptwriter] run={run_id}")
+        reviewed = _advance(
+            _adk_run_single_stage_async(agent=scriptwriter, state=state, expected_key="script", debug=debug, run_id=run_id),
+            reviewer=reviewer, stage="research", state=state, debug=debug,
         )
-        if debug:
-            print(f"[START:bsj_scriptwriter_repair] run={run_id}")
-        state = _adk_run_single_stage(agent=scriptwriter_repair, state=state, expected_key="script", debug=debug, run_id=run_id)
+        if reviewed is None:
+            return {"state": state}, "Review rejected at stage 'research'"
+        state = reviewed
         _validate_stage_output(state, key="script", expected_type=dict)
-
-    # Topic-grounding: if draft exists but appears off-topic relative to research topics, do a repair pass
-    try:
-        if _script_off_topic(state.get("script", {}), state.get("research", {}), state.get("topic", "")):
+        # One-time retry if empty/invalid content
+        if _script_is_empty(state.get("script", {})):
             if debug:
-                print("[RETRY:bsj_scriptwriter] Off-topic detected vs research/topic. Retrying with strict on-topic constraint.")
-            scriptwriter_on_topic = LlmAgent(
-                name="bsj_scriptwriter_on_topic",
-                model="gemini-2.5-flash",
-                description="Ensure script aligns to topic and research.",
-                instruction=(
-                    "You must write ONLY JSON as {\"script\": {\"beats\":[], \"draft\": \"...\", \"summary\": \"...\"}}.\n"
-                    "Stay STRICTLY on session.state.topic. Use at least 3 phrases from session.state.research.topics and reflect key_stats where natural.\n"
-                    "Do not mention unrelated domains (e.g., sports if topic is fashion)."
-                ),
-                output_key="script",
-                tools=[],
-            )
+                print("[RETRY:bsj_scriptwriter] Detected empty script fields. Retrying with stricter format reminder.")
+            scriptwriter_repair = _stage_agent("bsj_scriptwriter_repair")
             if debug:
-                print(f"[START:bsj_scriptwriter_on_topic] run={run_id}")
-            state = _adk_run_single_stage(agent=scriptwriter_on_topic, state=state, expected_key="script", debug=debug, run_id=run_id)
+                print(f"[START:bsj_scriptwriter_repair] run={run_id}")
+            state = _adk_run_single_stage(agent=scriptwriter_repair, state=state, expected_key="script", debug=debug, run_id=run_id)
             _validate_stage_output(state, key="script", expected_type=dict)
-    except Exception as e:
-        if debug:
-            print(f"[RETRY:bsj_scriptwriter] off-topic check error: {e}")
-    _append_review(state, stage="script")
-
-    # 3) Thumbnail prompts — reads script.summary, writes thumbnail_prompts
-    thumbnail_promptor = LlmAgent(
-        name="bsj_thumbnail_promptor",
-        model="gemini-2.5-flash",
-        description="Generate 3 Afrofuturist-style thumbnail prompts.",
-        instruction=(
-            "Read session.state.script.summary. Output JSON under 'thumbnail_prompts' as an array of 3 strings. "
-            "No prose outside JSON."
-        ),
-        output_key="thumbnail_prompts",
-        tools=[],
-    )
-    if debug:
-        print(f"[START:bsj_thumbnail_promptor] run={run_id}")
-    state = _adk_run_single_stage(agent=thumbnail_promptor, state=state, expected_key="thumbnail_prompts", debug=debug, run_id=run_id)
-    _validate_stage_output(state, key="thumbnail_prompts", expected_type=list)
-
-    # 4) Captioner — reads script.summary, writes captions
-    captioner = LlmAgent(
-        name="bsj_captioner",
-        model="gemini-2.5-flash",
-        description="Generate captions and hashtags for YouTube, TikTok, and Instagram.",
-        instruction=(
-            "Read session.state.script.summary and session.state.topic. Output ONLY JSON under 'captions' with keys youtube[], tiktok[], instagram[], hashtags[]. "
-            "All content must stay on the given topic. No prose outside JSON. Provide at least 2 items for youtube, tiktok, instagram, and at least 8 hashtags."
-        ),
-        output_key="captions",
-        tools=[],
-    )
-    if debug:
-        print(f"[START:bsj_captioner] run={run_id}")
-    state = _adk_run_single_stage(agent=captioner, state=state, expected_key="captions", debug=debug, run_id=run_id)
-    _validate_stage_output(state, key="captions", expected_type=dict)
-    # Retry captioner if any list is empty
-    caps = state.get("captions", {}) if isinstance(state.get("captions"), dict) else {}
-    def _empty_list(v):
-        return not isinstance(v, list) or len(v) == 0
-    if _empty_list(caps.get("youtube")) or _empty_list(caps.get("tiktok")) or _empty_list(caps.get("instagram")) or _empty_list(caps.get("hashtags")):
+
+        # Topic-grounding: if draft exists but appears off-topic relative to research topics, do a repair pass
+        try:
+            if _script_off_topic(state.get("script", {}), state.get("research", {}), state.get("topic", "")):
+                if debug:
+                    print("[RETRY:bsj_scriptwriter] Off-topic detected vs research/topic. Retrying with strict on-topic constraint.")
+                scriptwriter_on_topic = _stage_agent("bsj_scriptwriter_on_topic")
+                if debug:
+                    print(f"[START:bsj_scriptwriter_on_topic] run={run_id}")
+                state = _adk_run_single_stage(agent=scriptwriter_on_topic, state=state, expected_key="script", debug=debug, run_id=run_id)
+                _validate_stage_output(state, key="script", expected_type=dict)
+        except Exception as e:
+            if debug:
+                print(f"[RETRY:bsj_scriptwriter] off-topic check error: {e}")
+        if reviewer is None:
+            _append_review(state, stage="script")
+        checkpoints.save(run_id, "script", state)
+
+    if done < 3:
+        # 3-5) Thumbnail prompts, captions, and voiceover only read topic/research/
+        # script, so they run concurrently; each branch fires its own retry as soon
+        # as its first answer is in, without waiting for the others. With a
+        # reviewer, the whole batch runs speculatively while the script is reviewed.
         if debug:
-            print("[RETRY:bsj_captioner] Detected empty captions lists. Retrying with stricter format reminder.")
-        captioner_retry = LlmAgent(
-            name="bsj_captioner_retry",
-            model="gemini-2.5-flash",
-            description="Fill captions with topic-grounded content.",
-            instruction=(
-                "Respond with ONLY JSON under 'captions' containing non-empty arrays with at least 2 youtube, 2 tiktok, 2 instagram items, and >=8 hashtags.\n"
-                "Each item must clearly refer to session.state.topic and reflect session.state.script.summary. Avoid generic filler."
+            print(f"[START:bsj_thumbnail_promptor+bsj_captioner+bsj_voiceover] run={run_id}")
+        reviewed = _advance(
+            _adk_run_branches(
+                stages=[
+                    (_stage_agent("bsj_thumbnail_promptor"), "thumbnail_prompts", list, None),
+                    (_stage_agent("bsj_captioner"), "captions", dict, _captions_retry),
+                    (_stage_agent("bsj_voiceover"), "voiceover", dict, _voiceover_retry),
+                ],
+                state=state, debug=debug, run_id=run_id,
             ),
-            output_key="captions",
-            tools=[],
+            reviewer=reviewer, stage="script", state=state, debug=debug,
         )
-        if debug:
-            print(f"[START:bsj_captioner_retry] run={run_id}")
-        state = _adk_run_single_stage(agent=captioner_retry, state=state, expected_key="captions", debug=debug, run_id=run_id)
-        _validate_stage_output(state, key="captions", expected_type=dict)
-
-    # 5) Voiceover — reads script.draft, writes voiceover
-    voiceover = LlmAgent(
-        name="bsj_voiceover",
-        model="gemini-2.5-flash",
-        description="Transform script into voiceover-ready text.",
-        instruction=(
-            "Read session.state.script.draft and session.state.topic. Output ONLY JSON under 'voiceover' with key 'text' containing finalized, on-topic narration.\n"
-            "Explicitly reflect at least 2 ideas from session.state.research.topics."
-        ),
-        output_key="voiceover",
-        tools=[],
-    )
-    if debug:
-        print(f"[START:bsj_voiceover] run={run_id}")
-    state = _adk_run_single_stage(agent=voiceover, state=state, expected_key="voiceover", debug=debug, run_id=run_id)
-    _validate_stage_output(state, key="voiceover", expected_type=dict)
-    # Retry voiceover if empty or off-topic
-    try:
-        v = state.get("voiceover", {}) if isinstance(state.get("voiceover"), dict) else {}
-        vtext = v.get("text", "") if isinstance(v, dict) else ""
-        if not isinstance(vtext, str) or not vtext.strip() or _script_off_topic({"draft": vtext}, state.get("research", {}), state.get("topic", "")):
-            if debug:
-                print("[RETRY:bsj_voiceover] Empty or off-topic. Retrying with strict on-topic constraint.")
-            voiceover_retry = LlmAgent(
-                name="bsj_voiceover_retry",
-                model="gemini-2.5-flash",
-                description="Rewrite voiceover on-topic.",
-                instruction=(
-                    "Respond with ONLY JSON as {\"voiceover\": {\"text\": \"...\"}}.\n"
-                    "Stay strictly on session.state.topic, and reference at least 2 phrases from session.state.research.topics in natural language."
-                ),
-                output_key="voiceover",
-                tools=[],
-            )
-            if debug:
-                print(f"[START:bsj_voiceover_retry] run={run_id}")
-            state = _adk_run_single_stage(agent=voiceover_retry, state=state, expected_key="voiceover", debug=debug, run_id=run_id)
-            _validate_stage_output(state, key="voiceover", expected_type=dict)
-    except Exception as e:
-        if debug:
-            print(f"[RETRY:bsj_voiceover] check error: {e}")
+        if reviewed is None:
+            return {"state": state}, "Review rejected at stage 'script'"
+        state = reviewed
+        checkpoints.save(run_id, "media", state)
 
     # 6) Optional newsletter — reads script + research, writes newsletter
-    if include_newsletter:
-        newsletter = LlmAgent(
-            name="bsj_newsletter_rewriter",
-            model="gemini-2.5-flash",
-            description="Rewrite for newsletter and subject lines.",
-            instruction=(
-                "Read session.state.script and session.state.research. Output JSON under 'newsletter' with keys 'body' and 'subjects'[3]."
-            ),
-            output_key="newsletter",
-            tools=[],
-        )
+    if include_newsletter and done < 4:
+        newsletter = _stage_agent("bsj_newsletter_rewriter")
         if debug:
             print(f"[START:bsj_newsletter_rewriter] run={run_id}")
         state = _adk_run_single_stage(agent=newsletter, state=state, expected_key="newsletter", debug=debug, run_id=run_id)
         _validate_stage_output(state, key="newsletter", expected_type=dict)
+        checkpoints.save(run_id, "newsletter", state)
 
     # Wrap into session-like dict consistent with the rest of the app
     session: Dict[str, Any] = {"state": state}
     return session, None
 
 
+def resume_adk_pipeline(run_id: str, include_newsletter: bool = False, **kwargs: Any) -> tuple[Dict[str, Any] | None, str | None]:
+    """
+    Resume a checkpointed `run_adk_pipeline` run by its run_id (printed as
+    `[RUN <id>]` under --debug). Keyword arguments are passed through.
+    """
+    restored = checkpoints.load_latest(run_id, _PHASES)
+    if restored is None:
+        return None, f"No checkpoint found for run {run_id}"
+    topic = restored[1].get("topic")
+    if not isinstance(topic, str) or not topic:
+        return None, f"Checkpoint for run {run_id} has no topic"
+    return run_adk_pipeline(topic, include_newsletter, resume=True, **kwargs)
+
+
+def run_adk_pipeline_batch(
+    topics: list[str],
+    include_newsletter: bool = False,
+    *,
+    max_concurrent: int = 8,
+    debug: bool = False,
+) -> list[tuple[Dict[str, Any] | None, str | None]]:
+    """
+    Run `run_adk_pipeline` for many topics, at most `max_concurrent` at once.
+
+    Each pipeline drives its stages with asyncio.run, so runs go to worker
+    threads (each with its own event loops) rather than one shared loop.
+    Results are (session, error) pairs in input order; a duplicate topic runs
+    once and its positions share that result. An exception becomes that
+    topic's error instead of failing the batch.
+    """
+    _load_adk()  # bind ADK globals once, before the workers race to do it
+    unique = list(dict.fromkeys(topics))
+
+    def one(topic: str) -> tuple[Dict[str, Any] | None, str | None]:
+        try:
+            return run_adk_pipeline(topic, include_newsletter, debug=debug)
+        except Exception as e:
+            return None, f"{type(e).__name__}: {e}"
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_concurrent, len(unique) or 1))) as pool:
+        by_topic = dict(zip(unique, pool.map(one, unique)))
+    return [by_topic[t] for t in topics]
+
+
+async def run_adk_pipeline_batch_async(
+    topics: list[str],
+    include_newsletter: bool = False,
+    *,
+    max_concurrent: int = 8,
+    debug: bool = False,
+) -> list[tuple[Dict[str, Any] | None, str | None]]:
+    """Awaitable `run_adk_pipeline_batch` that keeps the caller's event loop free."""
+    return await asyncio.to_thread(
+        run_adk_pipeline_batch, topics, include_newsletter, max_concurrent=max_concurrent, debug=debug
+    )
+
+
 def _adk_run_single_stage(*, agent: Any, state: Dict[str, Any], expected_key: str, debug: bool, run_id: str) -> Dict[str, Any]:
+    """Sync wrapper around `_adk_run_single_stage_async` for sequential stages."""
+    return asyncio.run(
+        _adk_run_single_stage_async(agent=agent, state=state, expected_key=expected_key, debug=debug, run_id=run_id)
+    )
+
+
+async def _adk_run_branches(
+    *,
+    stages: list[tuple[Any, str, type, Optional[Callable[[Dict[str, Any]], Optional[tuple[str, str]]]]]],
+    state: Dict[str, Any],
+    debug: bool,
+    run_id: str,
+) -> Dict[str, Any]:
+    """
+    Run independent (agent, expected_key, expected_type, retry_check) stages
+    concurrently against the same input state and merge each output key into
+    a copy of it. Each stage gets its own session (ids are per agent name), so
+    they never collide. `retry_check(merged)` returns (retry agent name,
+    reason) when the stage's output needs a repair pass; the retry sees the
+    input state plus that stage's own output only, independent of which
+    sibling finished first.
+    """
+    merged = dict(state)
+    # Validation records are appended to meta's lists; copy them so the
+    # caller's state is not mutated through the shallow copy
+    meta = state.get("meta")
+    if isinstance(meta, dict):
+        merged["meta"] = {k: list(v) if isinstance(v, list) else v for k, v in meta.items()}
+
+    async def run_branch(agent: Any, key: str, expected_type: type, retry_check: Any) -> None:
+        out = await _adk_run_single_stage_async(agent=agent, state=state, expected_key=key, debug=debug, run_id=run_id)
+        if key in out:
+            merged[key] = out[key]
+        _validate_stage_output(merged, key=key, expected_type=expected_type)
+        if retry_check is None:
+            return
+        try:
+            retry = retry_check(merged)
+            if retry is None:
+                return
+            retry_name, reason = retry
+            if debug:
+                print(f"[RETRY:{agent.name}] {reason}")
+                print(f"[START:{retry_name}] run={run_id}")
+            out = await _adk_run_single_stage_async(
+                agent=_stage_agent(retry_name), state={**state, key: merged[key]},
+                expected_key=key, debug=debug, run_id=run_id,
+            )
+            if key in out:
+                merged[key] = out[key]
+            _validate_stage_output(merged, key=key, expected_type=expected_type)
+        except Exception as e:
+            if debug:
+                print(f"[RETRY:{agent.name}] check error: {e}")
+
+    await asyncio.gather(*(run_branch(*stage) for stage in stages))
+    return merged
+
+
+# Checkpointed phases of run_adk_pipeline, in order
+_PHASES = ("research", "script", "media", "newsletter")
+
+# Caption lists that must be non-empty to skip the captioner retry
+_CAPTION_LISTS = ("youtube", "tiktok", "instagram", "hashtags")
+
+
+def _captions_retry(state: Dict[str, Any]) -> Optional[tuple[str, str]]:
+    """Retry the captioner if any caption list is empty."""
+    caps = state.get("captions")
+    if not isinstance(caps, dict):
+        caps = {}
+    if all(isinstance(v, list) and v for v in map(caps.get, _CAPTION_LISTS)):
+        return None
+    return "bsj_captioner_retry", "Detected empty captions lists. Retrying with stricter format reminder."
+
+
+def _voiceover_retry(state: Dict[str, Any]) -> Optional[tuple[str, str]]:
+    """Retry the voiceover if its text is empty or off-topic."""
+    v = state.get("voiceover")
+    vtext = v.get("text", "") if isinstance(v, dict) else ""
+    if isinstance(vtext, str) and vtext.strip() and not _script_off_topic({"draft": vtext}, state.get("research", {}), state.get("topic", "")):
+        return None
+    return "bsj_voiceover_retry", "Empty or off-topic. Retrying with strict on-topic constraint."
+
+
+# Async human-review gate: reviewer(stage, state) resolves True to approve.
+# It must not mutate `state`, which the speculative next stage is reading.
+Reviewer = Callable[[str, Dict[str, Any]], Awaitable[bool]]
+
+
+async def _run_under_review(
+    next_stage: Awaitable[Dict[str, Any]], *, reviewer: Reviewer, stage: str, state: Dict[str, Any]
+) -> tuple[bool, Optional[Dict[str, Any]]]:
+    """
+    Await `reviewer(stage, state)` while `next_stage` runs speculatively as a
+    task; cancel the task if the review rejects (or fails).
+    """
+    task = asyncio.ensure_future(next_stage)
+    try:
+        approved = bool(await reviewer(stage, state))
+    except BaseException:
+        task.cancel()
+        raise
+    if not approved:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+        return False, None
+    return True, await task
+
+
+def _advance(
+    next_stage: Awaitable[Dict[str, Any]],
+    *,
+    reviewer: Optional[Reviewer],
+    stage: str,
+    state: Dict[str, Any],
+    debug: bool,
+) -> Optional[Dict[str, Any]]:
+    """
+    Run `next_stage` to completion and return its state. With a reviewer,
+    `stage` is reviewed concurrently and the verdict is recorded in
+    meta.reviews; returns None (leaving `state` as the result) on rejection.
+    """
+    if reviewer is None:
+        return asyncio.run(next_stage)
+    if debug:
+        print(f"[REVIEW:{stage}] awaiting reviewer; next stage runs speculatively")
+    approved, result = asyncio.run(_run_under_review(next_stage, reviewer=reviewer, stage=stage, state=state))
+    if not approved or result is None:
+        if debug:
+            print(f"[REVIEW:{stage}] rejected; speculative work cancelled")
+        _append_review(state, stage=stage, status="rejected")
+        return None
+    _append_review(result, stage=stage, status="approved")
+    return result
+
+
+_APP_NAME = "bsj"
+_SESSION_SERVICE: Any = None
+# agent name -> (agent, Runner, its session service); the agent is kept to
+# detect per-run rebuilds
+_RUNNERS: dict[str, tuple[Any, Any, Any]] = {}
+
+
+def _stage_runner(agent: Any) -> tuple[Any, Any]:
+    """
+    Return (runner, session_service) for `agent`. Every stage shares one
+    InMemorySessionService and each agent keeps its Runner across stages and
+    runs; a per-run agent reusing a name (the researcher) gets a fresh one.
     """
-    Helper to run a single `LlmAgent` stage using a fresh InMemoryRunner while
+    global _SESSION_SERVICE
+    entry = _RUNNERS.get(agent.name)
+    if entry is None or entry[0] is not agent:
+        if _SESSION_SERVICE is None:
+            _SESSION_SERVICE = InMemorySessionService()
+        # Pair the runner with the service it was built on, so concurrent
+        # batch workers never mix a runner with another service instance
+        service = _SESSION_SERVICE
+        entry = _RUNNERS[agent.name] = (agent, Runner(app_name=_APP_NAME, agent=agent, session_service=service), service)
+    return entry[1], entry[2]
+
+
+async def _adk_run_single_stage_async(*, agent: Any, state: Dict[str, Any], expected_key: str, debug: bool, run_id: str) -> Dict[str, Any]:
+    """
+    Helper to run a single `LlmAgent` stage on its shared Runner while
     carrying forward cumulative session state.
 
     Steps:
-    - Create runner with the provided agent
-    - Pre-create session using current state
+    - Look up the agent's runner and the shared session service
+    - Pre-create this stage's session using current state
     - Run with a small user prompt (agent reads state internally)
-    - Read back state from the session service and return it
+    - Read back state from the session service, drop the session, return it
     """
-    assert InMemoryRunner is not None and types is not None
-    runner = InMemoryRunner(agent=agent)
-
-    # Re-create session for this stage with the cumulative state
+    # Exact-match cache (BSJ_CACHE=1): identical prompt + input state -> reuse output
+    cache_key = stage_cache.stage_key(agent, expected_key, state) if stage_cache.enabled() else None
+    similar_stage: Optional[str] = None
+    if cache_key is not None:
+        cached = stage_cache.get(cache_key)
+        if cached is not stage_cache.MISS:
+            if debug:
+                print(f"[CACHE:{agent.name}] hit {cache_key[:12]}")
+            return {**state, expected_key: cached}
+        # Topic-only stages may reuse a paraphrased topic's output (BSJ_CACHE_SIMILARITY)
+        threshold = stage_cache.similarity_threshold()
+        if threshold is not None and state.keys() <= {"topic", "meta"}:
+            similar_stage = stage_cache.stage_id(agent, expected_key)
+            similar_key = stage_cache.find_similar(similar_stage, str(state.get("topic", "")), threshold)
+            cached = stage_cache.get(similar_key) if similar_key else stage_cache.MISS
+            if cached is not stage_cache.MISS:
+                if debug:
+                    print(f"[CACHE:{agent.name}] similar-topic hit {similar_key[:12]}")
+                return {**state, expected_key: cached}
+
+    assert Runner is not None and types is not None
+    runner, session_service = _stage_runner(agent)
+    user_id = f"bsj_user_{run_id}"
+    # run_id comes from the topic and the service is shared, so a per-call
+    # nonce keeps concurrent runs of one topic out of each other's sessions
+    session_id = f"bsj_{run_id}_{agent.name}_{uuid.uuid4().hex}"
+
+    # Create this stage's session with the cumulative state
     try:
-        runner._in_memory_session_service.create_session_sync(  # type: ignore[attr-defined]
-            app_name=runner.app_name,
-            user_id=f"bsj_user_{run_id}",
-            session_id=f"bsj_{run_id}_{agent.name}",
-            state=state,
-        )
+        await session_service.create_session(app_name=_APP_NAME, user_id=user_id, session_id=session_id, state=state)
     except Exception:
         pass
 
@@ -514,28 +827,45 @@ def _adk_run_single_stage(*, agent: Any, state: Dict[str, Any], expected_key: st
         parts=[types.Part(text=f"Proceed with your stage using session.state. Topic: {topic}")],
     )
     events_text: list[str] = []
-    for event in runner.run(user_id=f"bsj_user_{run_id}", session_id=f"bsj_{run_id}_{agent.name}", new_message=user_msg):
-        # Best-effort extract text from events
-        txt = _extract_event_text(event)
-        if txt:
-            events_text.append(txt)
+    try:
+        try:
+            async for event in runner.run_async(user_id=user_id, session_id=session_id, new_message=user_msg):
+                # Best-effort extract text from events
+                txt = _extract_event_text(event)
+                if txt:
+                    events_text.append(txt)
+                    if debug:
+                        print(f"[ADK:{agent.name}] {txt}")
+        except ValueError as e:
+            # output_schema validation of a truncated answer (pydantic's
+            # ValidationError is a ValueError); the stage's output check
+            # then falls back to its default
+            if getattr(agent, "output_schema", None) is None:
+                raise
             if debug:
-                print(f"[ADK:{agent.name}] {txt}")
+                print(f"[ADK:{agent.name}] output failed schema validation: {e}")
 
-    # Read back the session state, normalize to a plain dict, and inject parsed content if needed
-    try:
-        sess = runner._in_memory_session_service.get_session_sync(  # type: ignore[attr-defined]
-            app_name=runner.app_name,
-            user_id=f"bsj_user_{run_id}",
-            session_id=f"bsj_{run_id}_{agent.name}",
-        )
-        raw_state = getattr(sess, "state", {}) or {}
-    except Exception:
-        raw_state = {}
+        # Read back the session state, normalize to a plain dict, and inject parsed content if needed
+        try:
+            sess = await session_service.get_session(app_name=_APP_NAME, user_id=user_id, session_id=session_id)
+            raw_state = getattr(sess, "state", {}) or {}
+        except Exception:
+            raw_state = {}
+    finally:
+        # Free the session even if the stage fails or is cancelled (rejected
+        # review), so the shared service stays small
+        try:
+            await session_service.delete_session(app_name=_APP_NAME, user_id=user_id, session_id=session_id)
+        except Exception:
+            pass
 
-    # Normalize to a plain dict without relying on the underlying ADK type
-    if isinstance(raw_state, dict):
-        work_state: Dict[str, Any] = dict(raw_state)
+    # Normalize to a plain dict without relying on the underlying ADK type.
+    # get_session returns its own copy and the session is already deleted, so
+    # a plain dict is used as-is; only dict subclasses/proxies are copied.
+    if type(raw_state) is dict:
+        work_state: Dict[str, Any] = raw_state
+    elif isinstance(raw_state, dict):
+        work_state = dict(raw_state)
     else:
         # Fallback to previous state; attempt shallow copy
         work_state = dict(state)
@@ -557,12 +887,21 @@ def _adk_run_single_stage(*, agent: Any, state: Dict[str, Any], expected_key: st
                 work_state[expected_key] = coerced[expected_key]
             else:
                 work_state[expected_key] = coerced
+    # output_schema stages store the validated {expected_key: ...} wrapper
+    elif expected_key and isinstance(value := work_state.get(expected_key), dict) and value.keys() == {expected_key}:
+        work_state[expected_key] = value[expected_key]
 
     if debug:
         ek_present = expected_key in work_state
         ek_type = type(work_state.get(expected_key)).__name__ if ek_present else None
         print(f"[STATE:{agent.name}] keys={list(work_state.keys())} expected_key={expected_key} present={ek_present} type={ek_type}")
 
+    # Cache only parsed output; raw strings mean the model broke format
+    if cache_key is not None and isinstance(work_state.get(expected_key), (dict, list)):
+        stage_cache.put(cache_key, work_state[expected_key])
+        if similar_stage is not None:
+            stage_cache.index_topic(similar_stage, str(state.get("topic", "")), cache_key)
+
     return work_state
 
 
@@ -585,15 +924,18 @@ def _extract_event_text(event: Any) -> str:
         return ""
 
 
+# First {...} or [...] segment in model text; compiled once for the fallback path
+_JSON_BLOCK_RE = re.compile(r"(\{.*\}|\[.*\])", re.S)
+
+
 def _parse_json_from_texts(texts: list[str]) -> Any:
     """
     Combine text chunks, strip code fences, and parse JSON if present.
     Returns a Python object or None.
     """
-    import json
     if not texts:
         return None
-    blob = "\n".join(texts).strip()
+    blob = (texts[0] if len(texts) == 1 else "\n".join(texts)).strip()
     # Strip fenced blocks if any
     if blob.startswith("```"):
         # remove first line and trailing fence
@@ -601,42 +943,61 @@ def _parse_json_from_texts(texts: list[str]) -> Any:
         blob = "\n".join(lines).strip()
     # Try direct JSON
     try:
-        return json.loads(blob)
+        return _json_loads(blob)
     except Exception:
         pass
     # Try to locate first {...} or [...] segment
-    import re
-    m = re.search(r"(\{.*\}|\[.*\])", blob, flags=re.S)
+    m = _JSON_BLOCK_RE.search(blob)
     if m:
         candidate = m.group(1)
         try:
-            return json.loads(candidate)
+            return _json_loads(candidate)
         except Exception:
             return None
     return None
 
 
+# Fresh default value per expected stage type (containers must not be shared)
+_STAGE_DEFAULTS = {dict: dict, list: list, str: str, int: int, float: float}
+
+
+def _meta_list(state: Dict[str, Any], name: str) -> list:
+    """Return state["meta"][name], creating both levels on first use."""
+    meta = state.get("meta")
+    if meta is None:
+        meta = state["meta"] = {}
+    items = meta.get(name)
+    if items is None:
+        items = meta[name] = []
+    return items
+
+
 def _validate_stage_output(state: Dict[str, Any], *, key: str, expected_type: type) -> None:
     """
     Light schema guard: ensure that `state[key]` exists and matches `expected_type`.
     If missing or wrong type, create a safe default and note it for later inspection.
+
+    Kept for the schema-constrained stages too: a blocked response, or a
+    truncated one that fails output_schema validation, arrives not at all,
+    and the happy path here is a single lookup and isinstance check.
     """
-    if key not in state or not isinstance(state.get(key), expected_type):
+    # A missing key reads as None, which fails every expected_type check
+    if not isinstance(state.get(key), expected_type):
         # Create minimal safe defaults
-        defaults = {dict: {}, list: [], str: "", int: 0, float: 0.0}
-        state[key] = defaults.get(expected_type, None)
-        state.setdefault("meta", {}).setdefault("validation", []).append({
+        factory = _STAGE_DEFAULTS.get(expected_type)
+        state[key] = factory() if factory is not None else None
+        _meta_list(state, "validation").append({
             "key": key,
             "expected": expected_type.__name__,
             "status": "corrected_to_default",
         })
 
 
-def _append_review(state: Dict[str, Any], *, stage: str) -> None:
-    """Append a human review placeholder after a critical stage (e.g., script)."""
-    state.setdefault("meta", {}).setdefault("reviews", []).append({
+def _append_review(state: Dict[str, Any], *, stage: str, status: str = "auto-approved (adk)") -> None:
+    """Record a review verdict after a critical stage (auto-approved placeholder by default)."""
+    _meta_list(state, "reviews").append({
         "stage": stage,
-        "status": "auto-approved (adk)",
+        "status": status,
     })
 
 
@@ -656,21 +1017,38 @@ def _script_is_empty(script_obj: Dict[str, Any]) -> bool:
     return False
 
 
-def _extract_keywords(research_obj: Dict[str, Any]) -> set[str]:
-    """Extract a small set of lowercase keywords from research.topics for coarse matching."""
-    kws: set[str] = set()
-    try:
-        topics = research_obj.get("topics", []) if isinstance(research_obj, dict) else []
-        for t in topics:
-            if not isinstance(t, str):
-                continue
-            for w in t.lower().split():
-                w = ''.join(ch for ch in w if ch.isalnum())
-                if len(w) >= 5:
-                    kws.add(w)
-    except Exception:
-        pass
-    return kws
+# Alphanumeric runs; used to split research topics and the topic into words
+_WORD_RE = re.compile(r"[^\W_]+")
+# Known drift domains, matched as substrings in one regex pass
+_SPORTS_BLACKLIST = ("celtics", "heat", "nba", "playoffs", "season", "fenway", "patriots", "bruins", "redsox", "boston")
+_SPORTS_RE = re.compile("|".join(_SPORTS_BLACKLIST))
+
+
+def _research_topics(research_obj: Dict[str, Any]) -> tuple:
+    """research.topics as a hashable tuple of strings (the memo key)."""
+    topics = research_obj.get("topics", ()) if isinstance(research_obj, dict) else ()
+    if not isinstance(topics, (list, tuple)):
+        return ()
+    return tuple(t for t in topics if isinstance(t, str))
+
+
+@functools.lru_cache(maxsize=32)
+def _topic_keywords(topics: tuple, topic: str) -> frozenset[str]:
+    """Research keywords (>=5 chars) plus topic keywords (>=4 chars), memoized.
+
+    The scriptwriter check and the voiceover check (and retries) see the same
+    research/topic within a run, so the keyword set is built once.
+    """
+    kws = {w for t in topics for w in _WORD_RE.findall(t.lower()) if len(w) >= 5}
+    if topic:
+        kws.update(w for w in _WORD_RE.findall(topic.lower()) if len(w) >= 4)
+    return frozenset(kws)
+
+
+@functools.lru_cache(maxsize=64)
+def _keyword_pattern(kws: frozenset[str]) -> "re.Pattern[str]":
+    """One alternation regex so any-keyword checks scan the text once."""
+    return re.compile("|".join(map(re.escape, sorted(kws))))
 
 
 def _script_off_topic(script_obj: Dict[str, Any], research_obj: Dict[str, Any], topic: str = "") -> bool:
@@ -684,23 +1062,15 @@ def _script_off_topic(script_obj: Dict[str, Any], research_obj: Dict[str, Any],
         draft = script_obj.get("draft", "") if isinstance(script_obj, dict) else ""
         if not isinstance(draft, str) or not draft.strip():
             return True
-        kws = _extract_keywords(research_obj)
-        # Add topic-derived keywords (>=4 chars)
-        if isinstance(topic, str) and topic:
-            for w in topic.lower().split():
-                w = ''.join(ch for ch in w if ch.isalnum())
-                if len(w) >= 4:
-                    kws.add(w)
+        if not isinstance(topic, str):
+            topic = ""
+        kws = _topic_keywords(_research_topics(research_obj), topic)
         text = draft.lower()
         # Quick blacklist for known drift domains
-        sports_blacklist = {"celtics", "heat", "nba", "playoffs", "season", "fenway", "patriots", "bruins", "redsox", "boston"}
-        if isinstance(topic, str) and topic:
-            topic_l = topic.lower()
-            if not any(s in topic_l for s in sports_blacklist):
-                if any(s in text for s in sports_blacklist):
-                    return True
+        if topic and not _SPORTS_RE.search(topic.lower()) and _SPORTS_RE.search(text):
+            return True
         if not kws:
             return False  # cannot judge, don't block
-        return not any(kw in text for kw in kws)
+        return _keyword_pattern(kws).search(text) is None
     except Exception:
         return False
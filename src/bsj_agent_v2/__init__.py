@@ -24,10 +24,32 @@ Clean, ADK-native BSJ pipeline scaffold (non-destructive to existing bsj_agent c
 #
 from __future__ import annotations
 
-from .workflow import build_root
+from typing import Any
 
 # root_agent: the ADK entry point loaded by the Web UI / AgentLoader
-# - We build once at import time for simplicity. If you prefer a fresh build per
-#   session, you can wrap this in a callable or use an `agent.py` submodule.
-root_agent = build_root(debug=False)
+# - Built on first attribute access (PEP 562), not at import time, so importing
+#   the package for discovery or for submodules stays cheap. The instance is
+#   cached and shared with `bsj_agent_v2.agent.root_agent`.
+_root_agent: Any = None
 
+
+def __getattr__(name: str) -> Any:
+    if name == "root_agent":
+        global _root_agent
+        if _root_agent is None:
+            from .workflow import build_root
+
+            _root_agent = build_root(debug=False)
+        return _root_agent
+    if name == "app":
+        # Only exposed when Gemini context caching is enabled; otherwise the
+        # AgentLoader falls back to `root_agent`.
+        from .agents._adk import gemini_cache_enabled
+
+        if gemini_cache_enabled():
+            from .workflow import build_app
+
+            app = build_app(__getattr__("root_agent"))
+            if app is not None:
+                return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -9,10 +9,13 @@ This module is intentionally tiny and delegates graph construction to
 """
 from __future__ import annotations
 
-try:
-    from .workflow import build_root
-except Exception as e:  # pragma: no cover
-    raise
+from typing import Any
 
-# Construct the root agent once for the app. Toggle debug here if desired.
-root_agent = build_root(debug=False)
+
+def __getattr__(name: str) -> Any:
+    # Delegate to the package so the graph is built lazily, and only once
+    if name == "root_agent":
+        from . import root_agent
+
+        return root_agent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,90 @@
+"""
+bsj_agent_v2.agents._adk
+
+Deferred access to google-adk / google-genai for the v2 agent factories.
+
+Importing ADK walks a large module graph (pydantic models, protobuf, the genai
+client). Factories call these helpers on first use instead of importing at
+module top, so importing the package, the workflow, or the CLI for --help
+stays cheap until an agent is actually built.
+"""
+from __future__ import annotations
+
+import functools
+import os
+from typing import Any, Dict, Optional, Tuple
+
+
+@functools.lru_cache(maxsize=None)
+def load_llm_agent() -> Optional[Any]:
+    """Import and cache ADK's LlmAgent; None if ADK is missing."""
+    try:
+        from google.adk.agents import LlmAgent
+    except Exception:  # pragma: no cover
+        return None
+    return LlmAgent
+
+
+@functools.lru_cache(maxsize=None)
+def load_genai_types() -> Optional[Any]:
+    """Import and cache the google.genai types module; None if missing."""
+    try:
+        from google.genai import types
+    except Exception:  # pragma: no cover
+        return None
+    return types
+
+
+@functools.lru_cache(maxsize=None)
+def load_workflow_agents() -> Tuple[Optional[Any], Optional[Any]]:
+    """Import and cache (SequentialAgent, ParallelAgent); (None, None) if missing."""
+    try:
+        from google.adk.agents import ParallelAgent, SequentialAgent
+    except Exception:  # pragma: no cover
+        return None, None
+    return SequentialAgent, ParallelAgent
+
+
+@functools.lru_cache(maxsize=None)
+def load_review_tools() -> Tuple[Optional[Any], Optional[Any], Optional[Any]]:
+    """Import and cache (Agent, LongRunningFunctionTool, ToolContext); Nones if missing."""
+    try:
+        from google.adk import Agent
+        from google.adk.tools.long_running_tool import LongRunningFunctionTool
+        from google.adk.tools.tool_context import ToolContext
+    except Exception:  # pragma: no cover
+        return None, None, None
+    return Agent, LongRunningFunctionTool, ToolContext
+
+
+def gemini_cache_enabled() -> bool:
+    """True when BSJ_ENABLE_GEMINI_CACHE=1 opts in to Gemini context caching."""
+    return os.getenv("BSJ_ENABLE_GEMINI_CACHE", "0") == "1"
+
+
+def instruction_kwargs(text: str) -> Dict[str, Any]:
+    """LlmAgent kwargs carrying a fixed instruction.
+
+    With Gemini caching enabled the text goes to `static_instruction`, which
+    ADK sends verbatim as the system-instruction prefix that its context cache
+    (and Gemini's implicit cache) can reuse across turns. ADK versions without
+    that field keep the plain `instruction`.
+    """
+    LlmAgent = load_llm_agent()
+    if gemini_cache_enabled() and LlmAgent is not None and "static_instruction" in LlmAgent.model_fields:
+        return {"static_instruction": text}
+    return {"instruction": text}
+
+
+def load_context_cache_config() -> Optional[Any]:
+    """ContextCacheConfig when Gemini caching is enabled and ADK supports it.
+
+    TTL comes from BSJ_GEMINI_CACHE_TTL (seconds, default 3600).
+    """
+    if not gemini_cache_enabled():
+        return None
+    try:
+        from google.adk.agents.context_cache_config import ContextCacheConfig
+    except Exception:  # pragma: no cover
+        return None
+    return ContextCacheConfig(ttl_seconds=int(os.getenv("BSJ_GEMINI_CACHE_TTL", "3600")))
@@ -0,0 +1,63 @@
+"""
+bsj_agent_v2.agents._util
+
+Small helpers shared by the v2 agent callbacks.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+
+def strip_code_fences(s: str) -> str:
+    """Remove a leading ``` or ```json fence and a trailing ``` fence, if present."""
+    # prefix/suffix slicing instead of a regex pass over the whole output
+    s = s.strip()
+    if s.startswith("```"):
+        nl = s.find("\n")
+        if nl != -1 and s[3:nl].lower() in ("", "json"):
+            s = s[nl + 1:]
+    if s.endswith("\n```"):
+        s = s[:-4]
+    return s
+
+
+def as_items(value: Any) -> Any:
+    """Iterate a JSON value that may be a list or a single item.
+
+    Lists pass through; anything else becomes a one-item tuple (cheaper than a
+    list). JSON-decoded lists are never subclasses, so an exact type check
+    suffices.
+    """
+    return value if type(value) is list else (value,)
+
+
+def ui_enabled(state: Any) -> bool:
+    """False when the run is headless (state["_ui_enabled"] is False).
+
+    Callbacks skip building their *_markdown views for headless runs, since
+    only the ADK Web UI consumes them.
+    """
+    return state.get("_ui_enabled", True) is not False
+
+
+def is_partial(llm_response: Any) -> bool:
+    """True for an intermediate chunk of a streamed (SSE) model response.
+
+    In streaming mode ADK runs after_model_callback once per chunk and then
+    once more with the aggregated text. Callbacks skip the chunks and parse
+    only the final response, instead of re-joining and failing to parse a
+    growing prefix on every chunk.
+    """
+    return getattr(llm_response, "partial", None) is True
+
+
+def extract_text(llm_response: Any) -> str:
+    """Concatenated text of an LLM response's parts ("" if there are none).
+
+    Gemini usually answers with a single part, which is returned as-is
+    without building a joined copy; empty parts are skipped otherwise.
+    """
+    parts = getattr(getattr(llm_response, "content", None), "parts", None) or ()
+    if len(parts) == 1:
+        return parts[0].text or ""
+    return "".join(p.text for p in parts if p.text)
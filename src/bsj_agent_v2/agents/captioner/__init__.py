@@ -5,18 +5,39 @@ Generates captions + hashtags for YouTube, TikTok, Instagram from script summary
 """
 from __future__ import annotations
 
-from typing import Any
+import io
 import json
+from typing import Any
+
+from .._adk import instruction_kwargs, load_llm_agent
+from .._util import extract_text, is_partial, ui_enabled
 
+# Optional fast JSON decoder; both decoders raise ValueError subclasses.
 try:
-    from google.adk.agents import LlmAgent
-    from google.genai import types
+    import orjson
 except Exception:  # pragma: no cover
-    LlmAgent = None  # type: ignore
-    types = None  # type: ignore
+    orjson = None  # type: ignore
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _captions_markdown(caps: Any) -> str:
+    """Render captions as Markdown: one line per non-empty platform + hashtags."""
+    if not caps:
+        return "# Captions"
+    if not isinstance(caps, dict):
+        return f"# Captions\n{caps}"
+    buf = io.StringIO()
+    buf.write("# Captions")
+    for key in ("youtube", "tiktok", "instagram", "hashtags"):
+        value = caps.get(key)
+        if value:
+            buf.write(f"\n- **{key}**: {value}")
+    return buf.getvalue()
 
 
 def create_agent() -> Any:
+    LlmAgent = load_llm_agent()
     if LlmAgent is None:
         raise RuntimeError("ADK not available. Install google-adk and retry.")
 
@@ -32,44 +53,30 @@ def create_agent() -> Any:
         - Stores structured content in state['captions'] and a Markdown view in
           state['captions_markdown'] for UI consumption.
         """
+        if is_partial(llm_response):
+            return llm_response
+        text = extract_text(llm_response)
         try:
-            text = ""
-            if getattr(llm_response, "content", None) and llm_response.content.parts:
-                text = "".join([p.text or "" for p in llm_response.content.parts])
-            parsed = json.loads(text)
-            # Save structured value
-            try:
-                state = callback_context.state
-                state["captions"] = parsed.get("captions") if isinstance(parsed, dict) else parsed
-            except Exception:
-                pass
-
-            caps = parsed.get("captions") if isinstance(parsed, dict) else parsed
-            lines = ["# Captions"]
-            if isinstance(caps, dict):
-                for platform in ["youtube", "tiktok", "instagram"]:
-                    val = caps.get(platform)
-                    if val:
-                        lines.append(f"- **{platform}**: {val}")
-                tags = caps.get("hashtags")
-                if tags:
-                    lines.append(f"- **hashtags**: {tags}")
-            elif caps:
-                lines.append(str(caps))
-            md = "\n".join(lines)
-            try:
-                callback_context.state["captions_markdown"] = md
-            except Exception:
-                pass
+            parsed = _json_loads(text)
+        except ValueError:
             return llm_response
+
+        caps = parsed.get("captions") if isinstance(parsed, dict) else parsed
+        try:
+            state = callback_context.state
+            # Save structured value and, unless headless, the Markdown view
+            state["captions"] = caps
+            if ui_enabled(state):
+                state["captions_markdown"] = _captions_markdown(caps)
         except Exception:
-            return llm_response
+            pass
+        return llm_response
 
     return LlmAgent(
         name="bsj_captioner",
         model="gemini-2.5-flash",
         description="Generate platform captions and hashtags.",
-        instruction=instruction,
+        **instruction_kwargs(instruction),
         output_key="captions",
         after_model_callback=_after,
         # Let the model respond naturally; our callback renders Markdown and updates state.
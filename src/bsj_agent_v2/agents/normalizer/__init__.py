@@ -22,26 +22,32 @@ Implementation notes (ADK):
 """
 from __future__ import annotations
 
+import io
 import json
-import re
-from typing import Any, Optional
+from typing import Any, Dict, Optional, Tuple
 
 from google.adk.agents.base_agent import BaseAgent
 from google.adk.agents.callback_context import CallbackContext
 from google.adk.events.event import Event
+from pydantic import PrivateAttr
 from ...tools.mcp_utils import validate_state_for_ui
+from .._util import as_items, strip_code_fences
 try:
     from google.genai import types
 except Exception:  # pragma: no cover
     types = None  # type: ignore
 
+# Optional fast JSON decoder; both decoders raise ValueError subclasses.
+try:
+    import orjson
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
 
-_CODEFENCE_RE = re.compile(r"^```(?:json)?\n|\n```$", re.IGNORECASE)
+_json_loads = orjson.loads if orjson is not None else json.loads
 
 
-def _strip_code_fences(s: str) -> str:
-    # remove leading/trailing triple backticks optionally labeled json
-    return _CODEFENCE_RE.sub("", s.strip())
+# State keys holding JSON that LLM agents may have written as strings
+_JSON_KEYS = ("script", "thumbnail_prompts", "captions", "voiceover")
 
 
 class JSONNormalizerAgent(BaseAgent):
@@ -50,137 +56,164 @@ class JSONNormalizerAgent(BaseAgent):
     It does all work in before_agent_callback to leverage ADK's State delta.
     """
 
+    # Caches are pydantic private attributes rather than __slots__: BaseModel
+    # already slots __dict__, and private values share the single
+    # __pydantic_private__ dict per instance.
+    # key -> hash of the last string that failed to parse, so an unchanged
+    # non-JSON value is not re-parsed on every turn
+    _unparsed: Dict[str, int] = PrivateAttr(default_factory=dict)
+    # (key, value) pairs behind the last _ui_state; values are compared by
+    # identity, since state writes replace values rather than mutate them
+    _ui_sources: Tuple[Any, ...] = PrivateAttr(default=())
+    _ui_cached: Optional[Dict[str, Any]] = PrivateAttr(default=None)
+
     def __init__(self, *, name: str = "bsj_json_normalizer") -> None:
         super().__init__(name=name, description="Normalize JSON strings in state")
         self.before_agent_callback = self._before
 
     async def _before(self, *, callback_context: CallbackContext) -> Optional[Any]:
         state = callback_context.state
-        keys = ("script", "thumbnail_prompts", "captions", "voiceover")
-        for k in keys:
+        unparsed = self._unparsed
+        # Collect string values first; already-structured values (the common
+        # case) and strings already known not to parse need no work
+        pending = [
+            (k, v, h)
+            for k in _JSON_KEYS
+            if isinstance((v := state.get(k)), str) and unparsed.get(k) != (h := hash(v))
+        ]
+        for k, v, h in pending:
             try:
-                v = state.get(k)
-            except Exception:
-                v = None
-            if isinstance(v, str):
-                raw = _strip_code_fences(v)
-                try:
-                    parsed = json.loads(raw)
-                    state[k] = parsed
-                except Exception:
-                    # If it's not valid JSON, leave as-is.
-                    pass
+                state[k] = _json_loads(strip_code_fences(v))
+                unparsed.pop(k, None)
+            except ValueError:
+                # If it's not valid JSON, leave as-is.
+                unparsed[k] = h
         # Provide a UI-friendly, flattened & validated snapshot without
         # mutating originals, so ADK Web renders a compact, readable view.
-        try:
-            state["_ui_state"] = validate_state_for_ui(state)
-        except Exception:
-            # Best-effort only; never block pipeline.
-            pass
+        sources = tuple((k, state.get(k)) for k in state if k != "_ui_state")
+        last = self._ui_sources
+        if (
+            self._ui_cached is not None
+            and len(last) == len(sources)
+            and all(a[0] == b[0] and a[1] is b[1] for a, b in zip(last, sources))
+        ):
+            state["_ui_state"] = self._ui_cached
+        else:
+            try:
+                ui_state = validate_state_for_ui(state)
+                state["_ui_state"] = ui_state
+                self._ui_sources = sources
+                self._ui_cached = ui_state
+            except Exception:
+                # Best-effort only; never block pipeline.
+                pass
         # Emit a single Markdown Event that summarizes major outputs for the UI.
         # This renders nicely in the Chat/Events pane while preserving JSON in state.
-        try:
-            md_lines: list[str] = []
-            # Research
-            research = state.get("research")
-            if research:
-                md_lines.append("# Research Findings")
-                topics = None
-                key_stats = None
-                citations = None
-                if isinstance(research, dict):
-                    topics = research.get("topics")
-                    key_stats = research.get("key_stats")
-                    citations = research.get("citations")
-                if topics:
-                    md_lines.append("\n**Topics**:")
-                    for t in (topics if isinstance(topics, list) else [topics]):
-                        md_lines.append(f"- {t}")
-                if key_stats:
-                    md_lines.append("\n**Key Stats**:")
-                    for ks in (key_stats if isinstance(key_stats, list) else [key_stats]):
-                        try:
-                            label = ks.get("label", "stat")
-                            value = ks.get("value", "-")
-                            src = ks.get("source")
-                            if src:
-                                md_lines.append(f"- {label}: {value} (source: {src})")
-                            else:
-                                md_lines.append(f"- {label}: {value}")
-                        except Exception:
-                            md_lines.append(f"- {ks}")
-                if citations:
-                    md_lines.append("\n**Citations**:")
-                    for c in (citations if isinstance(citations, list) else [citations]):
-                        try:
-                            title = c.get("title", "link")
-                            url = c.get("url", "-")
-                            md_lines.append(f"- [{title}]({url})")
-                        except Exception:
-                            md_lines.append(f"- {c}")
-
-            # Script
-            script = state.get("script")
-            if script:
-                md_lines.append("\n# Script")
-                if isinstance(script, dict):
-                    beats = script.get("beats")
-                    draft = script.get("draft")
-                    summary = script.get("summary")
-                    if beats:
-                        md_lines.append("\n**Beats**:")
-                        for b in (beats if isinstance(beats, list) else [beats]):
-                            md_lines.append(f"- {b}")
-                    if summary:
-                        md_lines.append("\n**Summary**:\n")
-                        md_lines.append(str(summary))
-                    if draft:
-                        md_lines.append("\n**Draft**:\n")
-                        md_lines.append(str(draft))
-                else:
-                    md_lines.append(str(script))
-
-            # Thumbnail prompts
-            thumbs = state.get("thumbnail_prompts")
-            if thumbs:
-                md_lines.append("\n# Thumbnail Prompts")
-                for p in (thumbs if isinstance(thumbs, list) else [thumbs]):
-                    md_lines.append(f"- {p}")
-
-            # Captions
-            captions = state.get("captions")
-            if captions:
-                md_lines.append("\n# Captions")
-                for cap in (captions if isinstance(captions, list) else [captions]):
-                    if isinstance(cap, dict):
-                        platform = cap.get("platform", "post")
-                        text = cap.get("text") or cap.get("caption") or cap
-                        tags = cap.get("hashtags")
-                        line = f"- **{platform}**: {text}"
-                        if tags:
-                            line += f"  {tags}"
-                        md_lines.append(line)
+        # Stream sections into one buffer; every write ends its own line
+        buf = io.StringIO()
+        write = buf.write
+        # Research; reuse the researcher's own rendering when it left one
+        research = state.get("research")
+        research_md = state.get("research_markdown")
+        if research and isinstance(research_md, str) and research_md:
+            write(f"{research_md}\n")
+        elif research:
+            write("# Research Findings\n")
+            topics = None
+            key_stats = None
+            citations = None
+            if isinstance(research, dict):
+                topics = research.get("topics")
+                key_stats = research.get("key_stats")
+                citations = research.get("citations")
+            if topics:
+                write("\n**Topics**:\n")
+                for t in as_items(topics):
+                    write(f"- {t}\n")
+            if key_stats:
+                write("\n**Key Stats**:\n")
+                for ks in as_items(key_stats):
+                    if not isinstance(ks, dict):
+                        write(f"- {ks}\n")
+                        continue
+                    label = ks.get("label", "stat")
+                    value = ks.get("value", "-")
+                    src = ks.get("source")
+                    write(f"- {label}: {value} (source: {src})\n" if src else f"- {label}: {value}\n")
+            if citations:
+                write("\n**Citations**:\n")
+                for c in as_items(citations):
+                    if isinstance(c, dict):
+                        write(f"- [{c.get('title', 'link')}]({c.get('url', '-')})\n")
                     else:
-                        md_lines.append(f"- {cap}")
-
-            # Voiceover
-            voice = state.get("voiceover")
-            if voice:
-                md_lines.append("\n# Voiceover")
-                if isinstance(voice, dict):
-                    vo_sum = voice.get("summary") or voice.get("script") or voice
-                    md_lines.append(str(vo_sum))
+                        write(f"- {c}\n")
+
+        # Script; likewise reuse the scriptwriter's rendering
+        script = state.get("script")
+        script_md = state.get("script_markdown")
+        if script and isinstance(script_md, str) and script_md:
+            write(f"\n{script_md}\n")
+        elif script:
+            write("\n# Script\n")
+            if isinstance(script, dict):
+                beats = script.get("beats")
+                draft = script.get("draft")
+                summary = script.get("summary")
+                if beats:
+                    write("\n**Beats**:\n")
+                    for b in as_items(beats):
+                        write(f"- {b}\n")
+                if summary:
+                    write("\n**Summary**:\n\n")
+                    write(f"{summary}\n")
+                if draft:
+                    write("\n**Draft**:\n\n")
+                    write(f"{draft}\n")
+            else:
+                write(f"{script}\n")
+
+        # Thumbnail prompts
+        thumbs = state.get("thumbnail_prompts")
+        if thumbs:
+            write("\n# Thumbnail Prompts\n")
+            for p in as_items(thumbs):
+                write(f"- {p}\n")
+
+        # Captions
+        captions = state.get("captions")
+        if captions:
+            write("\n# Captions\n")
+            for cap in as_items(captions):
+                if isinstance(cap, dict):
+                    platform = cap.get("platform", "post")
+                    text = cap.get("text") or cap.get("caption") or cap
+                    tags = cap.get("hashtags")
+                    line = f"- **{platform}**: {text}"
+                    if tags:
+                        line += f"  {tags}"
+                    write(f"{line}\n")
                 else:
-                    md_lines.append(str(voice))
-
-            md_text = "\n".join(md_lines).strip()
-            if md_text:
-                if types is not None:
+                    write(f"- {cap}\n")
+
+        # Voiceover
+        voice = state.get("voiceover")
+        if voice:
+            write("\n# Voiceover\n")
+            if isinstance(voice, dict):
+                vo_sum = voice.get("summary") or voice.get("script") or voice
+                write(f"{vo_sum}\n")
+            else:
+                write(f"{voice}\n")
+
+        md_text = buf.getvalue().strip()
+        if md_text:
+            if types is not None:
+                try:
                     return types.Content(parts=[types.Part(text=md_text)])
-                return md_text
-        except Exception:
-            # Never block the pipeline on formatting errors
-            pass
+                except Exception:
+                    # Never block the pipeline on formatting errors
+                    pass
+            return md_text
         return None
 
     async def _run_async_impl(self, ctx) -> Any:  # type: ignore[override]
@@ -11,14 +11,25 @@ from __future__ import annotations
 from typing import Any, List
 import json
 
+from ...tools.mcp_utils import build_tavily_toolset
+from .._adk import instruction_kwargs, load_llm_agent
+from .._util import as_items, extract_text, is_partial, strip_code_fences, ui_enabled
+
+# Optional fast JSON decoder; both decoders raise ValueError subclasses.
 try:
-    from google.adk.agents import LlmAgent
-    from google.genai import types
+    import orjson
 except Exception:  # pragma: no cover
-    LlmAgent = None  # type: ignore
-    types = None  # type: ignore
+    orjson = None  # type: ignore
+
+_json_loads = orjson.loads if orjson is not None else json.loads
 
-from ...tools.mcp_utils import build_tavily_toolset
+
+_INSTRUCTION = (
+    "You are the BSJ researcher. Read session.state.topic and stay STRICTLY on that topic.\n"
+    "Use tools FIRST: perform SEARCH using a tool whose name contains 'search' or 'web'; then FETCH full content using a tool whose name contains 'crawl' or 'fetch'.\n"
+    "Do not answer until you have used at least one search tool and one fetch/crawl tool. If tools are unavailable, return minimal findings.\n"
+    "Produce: topics (bulleted subtopics), key_stats (label – value – source), and citations (title with URL)."
+)
 
 
 def create_agent(*, debug: bool = False) -> Any:
@@ -27,6 +38,7 @@ def create_agent(*, debug: bool = False) -> Any:
     Returns:
       An ADK `LlmAgent` configured to research a topic using MCP tools.
     """
+    LlmAgent = load_llm_agent()
     if LlmAgent is None:
         raise RuntimeError("ADK not available. Install google-adk and retry.")
 
@@ -53,13 +65,6 @@ def create_agent(*, debug: bool = False) -> Any:
         except Exception:
             pass
 
-    instruction = (
-        "You are the BSJ researcher. Read session.state.topic and stay STRICTLY on that topic.\n"
-        "Use tools FIRST: perform SEARCH using a tool whose name contains 'search' or 'web'; then FETCH full content using a tool whose name contains 'crawl' or 'fetch'.\n"
-        "Do not answer until you have used at least one search tool and one fetch/crawl tool. If tools are unavailable, return minimal findings.\n"
-        "Produce: topics (bulleted subtopics), key_stats (label – value – source), and citations (title with URL)."
-    )
-
     def _after_model(callback_context, llm_response):
         """Parse JSON when present, update state, and keep ADK-compatible return.
 
@@ -71,23 +76,31 @@ def create_agent(*, debug: bool = False) -> Any:
         - Build a Markdown summary and store it in state['research_markdown'] for UI.
         - Return the original `llm_response` object (not a string).
         """
+        if is_partial(llm_response):
+            return llm_response
         try:
-            text = ""
-            if getattr(llm_response, "content", None) and getattr(llm_response.content, "parts", None):
-                text = "".join([(p.text or "") for p in llm_response.content.parts])
+            text = extract_text(llm_response)
             # Try parse JSON if the model produced it
             parsed = None
             if text:
                 try:
-                    parsed = json.loads(text)
-                except Exception:
-                    parsed = None
-
+                    parsed = _json_loads(text)
+                except ValueError:
+                    try:
+                        parsed = _json_loads(strip_code_fences(text))
+                    except ValueError:
+                        parsed = None
+
+            state = callback_context.state
             if parsed is not None:
                 try:
-                    callback_context.state["research"] = parsed
+                    state["research"] = parsed
                 except Exception:
                     pass
+            if not ui_enabled(state):
+                return llm_response
+
+            if parsed is not None:
 
                 topics = parsed.get("topics") if isinstance(parsed, dict) else None
                 key_stats = parsed.get("key_stats") if isinstance(parsed, dict) else None
@@ -95,11 +108,10 @@ def create_agent(*, debug: bool = False) -> Any:
                 lines = ["# Research Findings"]
                 if topics:
                     lines.append("\n**Topics**:")
-                    for t in (topics if isinstance(topics, list) else [topics]):
-                        lines.append(f"- {t}")
+                    lines.append("\n".join(f"- {t}" for t in as_items(topics)))
                 if key_stats:
                     lines.append("\n**Key Stats**:")
-                    for s in (key_stats if isinstance(key_stats, list) else [key_stats]):
+                    for s in as_items(key_stats):
                         if isinstance(s, dict):
                             label = s.get("label", "")
                             value = s.get("value", "")
@@ -109,7 +121,7 @@ def create_agent(*, debug: bool = False) -> Any:
                             lines.append(f"- {s}")
                 if citations:
                     lines.append("\n**Citations**:")
-                    for c in (citations if isinstance(citations, list) else [citations]):
+                    for c in as_items(citations):
                         if isinstance(c, dict):
                             title = c.get("title", "")
                             url = c.get("url", "")
@@ -117,7 +129,7 @@ def create_agent(*, debug: bool = False) -> Any:
                         else:
                             lines.append(f"- {c}")
                 try:
-                    callback_context.state["research_markdown"] = "\n".join(lines)
+                    state["research_markdown"] = "\n".join(lines)
                 except Exception:
                     pass
                 return llm_response
@@ -125,7 +137,7 @@ def create_agent(*, debug: bool = False) -> Any:
             # Fallback: no JSON, render raw text as Markdown
             if text:
                 try:
-                    callback_context.state["research_markdown"] = "# Research Findings\n\n" + text
+                    state["research_markdown"] = "# Research Findings\n\n" + text
                 except Exception:
                     pass
                 return llm_response
@@ -137,12 +149,12 @@ def create_agent(*, debug: bool = False) -> Any:
         name="bsj_researcher",
         model="gemini-2.5-pro",
         description="Research subtopics, key stats, and citations.",
-        instruction=instruction,
+        **instruction_kwargs(_INSTRUCTION),
         tools=tools,
         output_key="research",
         before_tool_callback=_before,
         after_tool_callback=_after,
         after_model_callback=_after_model,
         # Do NOT set response_mime_type here due to tool-calling constraints.
-        generate_content_config=None if types is not None else None,
+        generate_content_config=None,
     )
@@ -21,25 +21,55 @@ This file is extensively commented for ADK learners, per project standards.
 """
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
 from datetime import datetime
+import functools
+import time
 
-try:
-    # ADK core Agent type and LongRunningFunctionTool for HITL
-    from google.adk import Agent
-    from google.adk.tools.long_running_tool import LongRunningFunctionTool
-    from google.adk.tools.tool_context import ToolContext
-    from google.genai import types
-except Exception:  # pragma: no cover
-    Agent = None  # type: ignore
-    LongRunningFunctionTool = None  # type: ignore
-    ToolContext = None  # type: ignore
-    types = None  # type: ignore
+# ADK core Agent type and LongRunningFunctionTool for HITL are imported on
+# first use via .._adk, keeping module import free of the ADK graph.
+from .._adk import load_genai_types, load_review_tools
+
+# Bound by create_review_agent. ADK resolves the tool's annotations with
+# typing.get_type_hints when it builds the declaration, so this must be a
+# real module global rather than a TYPE_CHECKING-only import.
+ToolContext: Any = None
+
+
+@functools.lru_cache(maxsize=None)
+def _review_config() -> Optional[Any]:
+    """Deterministic, tiny-output config shared by every review gate.
+
+    ADK copies the config per request, so one instance is safe to reuse.
+    """
+    types = load_genai_types()
+    if types is None:
+        return None
+    return types.GenerateContentConfig(
+        temperature=0.0,
+        max_output_tokens=16,
+        candidate_count=1,
+    )
+
+
+# (epoch second, formatted) of the last _now_iso call; swapped as one tuple
+# so concurrent callers never see a mismatched pair
+_last_ts: Tuple[int, str] = (0, "")
 
 
 def _now_iso() -> str:
-    """Utility to format current time as ISO8601 string."""
-    return datetime.now().isoformat()
+    """Utility to format current time as ISO8601 string (second precision).
+
+    Approvals are human-scale events, so the formatted string is reused for
+    every call within the same wall-clock second.
+    """
+    global _last_ts
+    t = int(time.time())
+    cached = _last_ts
+    if cached[0] != t:
+        cached = (t, datetime.fromtimestamp(t).isoformat())
+        _last_ts = cached
+    return cached[1]
 
 
 def _make_review_tool(approval_state_key: str, markdown_state_key: str):
@@ -128,6 +158,8 @@ def create_review_agent(
     Returns:
       An ADK `Agent` instance configured with a LongRunningFunctionTool.
     """
+    global ToolContext
+    Agent, LongRunningFunctionTool, ToolContext = load_review_tools()
     if Agent is None or LongRunningFunctionTool is None:
         raise RuntimeError("ADK not available. Install google-adk and retry.")
 
@@ -156,11 +188,5 @@ def create_review_agent(
         ),
         instruction=instruction,
         tools=[LongRunningFunctionTool(func=ask_for_approval)],
-        generate_content_config=types.GenerateContentConfig(
-            temperature=0.0,
-            max_output_tokens=16,
-            candidate_count=1,
-        )
-        if types is not None
-        else None,
+        generate_content_config=_review_config(),
     )
@@ -10,24 +10,36 @@ from __future__ import annotations
 from typing import Any
 import json
 
+from ...tools.semantic_cache import semantic_callbacks
+from .._adk import instruction_kwargs, load_llm_agent
+from .._util import as_items, extract_text, is_partial, strip_code_fences, ui_enabled
+
+# Optional fast JSON decoder; both decoders raise ValueError subclasses.
 try:
-    from google.adk.agents import LlmAgent
-    from google.genai import types
+    import orjson
 except Exception:  # pragma: no cover
-    LlmAgent = None  # type: ignore
-    types = None  # type: ignore
+    orjson = None  # type: ignore
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+_INSTRUCTION = (
+    "You are the BSJ scriptwriter. Use session.state.research.topics and "
+    "session.state.research.key_stats to craft a BSJ-tone narrative.\n"
+    "Produce: beats (5-8 bullet points), a 400-700 word draft, and a summary (<=60 words)."
+)
+
+
+def _semantic_key(state: Any) -> Any:
+    """Prompt inputs for the semantic cache: the research findings."""
+    return state.get("research")
 
 
 def create_agent() -> Any:
+    LlmAgent = load_llm_agent()
     if LlmAgent is None:
         raise RuntimeError("ADK not available. Install google-adk and retry.")
 
-    instruction = (
-        "You are the BSJ scriptwriter. Use session.state.research.topics and "
-        "session.state.research.key_stats to craft a BSJ-tone narrative.\n"
-        "Produce: beats (5-8 bullet points), a 400-700 word draft, and a summary (<=60 words)."
-    )
-
     def _after(callback_context, llm_response):
         """Parse JSON, store Markdown in state, and return the original response.
 
@@ -37,18 +49,24 @@ def create_agent() -> Any:
         - Build Markdown and store at state['script_markdown'] for UI.
         - Return `llm_response` to keep the flow ADK-compatible.
         """
+        if is_partial(llm_response):
+            return llm_response
         try:
-            text = ""
-            if getattr(llm_response, "content", None) and llm_response.content.parts:
-                text = "".join([p.text or "" for p in llm_response.content.parts])
-            # Attempt to parse JSON (model is instructed to output JSON only)
-            parsed = json.loads(text)
+            text = extract_text(llm_response)
+            # Attempt to parse JSON (model is instructed to output JSON only);
+            # strip a ```json fence only when the plain parse fails
+            try:
+                parsed = _json_loads(text)
+            except ValueError:
+                parsed = _json_loads(strip_code_fences(text))
             # Save structured value for the pipeline and UI state panel
+            state = callback_context.state
             try:
-                state = callback_context.state
                 state["script"] = parsed
             except Exception:
                 pass
+            if not ui_enabled(state):
+                return llm_response
 
             # Build compact Markdown for the Chat/Events panel
             beats = parsed.get("beats") if isinstance(parsed, dict) else None
@@ -58,8 +76,7 @@ def create_agent() -> Any:
             lines = ["# Script"]
             if beats:
                 lines.append("\n**Beats**:")
-                for b in (beats if isinstance(beats, list) else [beats]):
-                    lines.append(f"- {b}")
+                lines.append("\n".join(f"- {b}" for b in as_items(beats)))
             if summary:
                 lines.append("\n**Summary**:\n")
                 lines.append(str(summary))
@@ -67,9 +84,8 @@ def create_agent() -> Any:
                 lines.append("\n**Draft**:\n")
                 lines.append(str(draft))
 
-            md = "\n".join(lines)
             try:
-                callback_context.state["script_markdown"] = md
+                state["script_markdown"] = "\n".join(lines)
             except Exception:
                 pass
             return llm_response
@@ -81,9 +97,9 @@ def create_agent() -> Any:
         name="bsj_scriptwriter",
         model="gemini-2.5-flash",
         description="Transform research into a narrative script.",
-        instruction=instruction,
+        **instruction_kwargs(_INSTRUCTION),
         output_key="script",
-        after_model_callback=_after,
+        **semantic_callbacks("bsj_scriptwriter", _semantic_key, _after),
         # Tools are not used here; enforcing JSON mime type is supported.
         # Let the model respond naturally; our callback renders Markdown and updates state.
     )
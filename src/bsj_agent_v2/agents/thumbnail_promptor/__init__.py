@@ -8,15 +8,38 @@ from __future__ import annotations
 from typing import Any
 import json
 
+from ...tools.semantic_cache import semantic_callbacks
+from .._adk import instruction_kwargs, load_llm_agent
+from .._util import as_items, extract_text, is_partial, strip_code_fences, ui_enabled
+
+# Optional fast JSON decoder; both decoders raise ValueError subclasses.
 try:
-    from google.adk.agents import LlmAgent
-    from google.genai import types
+    import orjson
 except Exception:  # pragma: no cover
-    LlmAgent = None  # type: ignore
-    types = None  # type: ignore
+    orjson = None  # type: ignore
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _script(state: Any) -> Any:
+    """state["script"], decoded when the scriptwriter's output_key left raw text."""
+    script = state.get("script")
+    if isinstance(script, str):
+        try:
+            return _json_loads(strip_code_fences(script))
+        except ValueError:
+            return None
+    return script
+
+
+def _semantic_key(state: Any) -> Any:
+    """Prompt inputs for the semantic cache: the script summary."""
+    script = _script(state)
+    return script.get("summary") if isinstance(script, dict) else None
 
 
 def create_agent() -> Any:
+    LlmAgent = load_llm_agent()
     if LlmAgent is None:
         raise RuntimeError("ADK not available. Install google-adk and retry.")
 
@@ -32,30 +55,27 @@ def create_agent() -> Any:
         - Markdown: state['thumbnail_prompts_markdown']
         - Return llm_response to keep ADK postprocessors intact.
         """
+        if is_partial(llm_response):
+            return llm_response
         try:
-            text = ""
-            if getattr(llm_response, "content", None) and llm_response.content.parts:
-                text = "".join([p.text or "" for p in llm_response.content.parts])
-            parsed = json.loads(text)
+            text = extract_text(llm_response)
+            parsed = _json_loads(text)
+            # Accept either {'thumbnail_prompts': [...]} or direct list
+            prompts = parsed.get("thumbnail_prompts") if isinstance(parsed, dict) else parsed
             # Save to state
+            state = callback_context.state
             try:
-                state = callback_context.state
-                # Accept either {'thumbnail_prompts': [...]} or direct list
-                val = parsed.get("thumbnail_prompts") if isinstance(parsed, dict) else parsed
-                state["thumbnail_prompts"] = val
+                state["thumbnail_prompts"] = prompts
             except Exception:
                 pass
+            if not ui_enabled(state):
+                return llm_response
 
-            prompts = (
-                parsed.get("thumbnail_prompts") if isinstance(parsed, dict) else parsed
-            )
-            lines = ["# Thumbnail Prompts"]
+            md = "# Thumbnail Prompts"
             if prompts:
-                for p in (prompts if isinstance(prompts, list) else [prompts]):
-                    lines.append(f"- {p}")
-            md = "\n".join(lines)
+                md += "\n" + "\n".join(f"- {p}" for p in as_items(prompts))
             try:
-                callback_context.state["thumbnail_prompts_markdown"] = md
+                state["thumbnail_prompts_markdown"] = md
             except Exception:
                 pass
             return llm_response
@@ -66,8 +86,8 @@ def create_agent() -> Any:
         name="bsj_thumbnail_promptor",
         model="gemini-2.5-flash",
         description="Generate 3 Afrofuturist thumbnail prompts.",
-        instruction=instruction,
+        **instruction_kwargs(instruction),
         output_key="thumbnail_prompts",
-        after_model_callback=_after,
+        **semantic_callbacks("bsj_thumbnail_promptor", _semantic_key, _after),
         # Let the model respond naturally; our callback renders Markdown and updates state.
     )
@@ -8,15 +8,39 @@ from __future__ import annotations
 from typing import Any
 import json
 
+from ...tools.semantic_cache import semantic_callbacks
+from .._adk import instruction_kwargs, load_llm_agent
+from .._util import extract_text, is_partial, strip_code_fences, ui_enabled
+
+# Optional fast JSON decoder; both decoders raise ValueError subclasses.
 try:
-    from google.adk.agents import LlmAgent
-    from google.genai import types
+    import orjson
 except Exception:  # pragma: no cover
-    LlmAgent = None  # type: ignore
-    types = None  # type: ignore
+    orjson = None  # type: ignore
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _script(state: Any) -> Any:
+    """state["script"], decoded when the scriptwriter's output_key left raw text."""
+    script = state.get("script")
+    if isinstance(script, str):
+        try:
+            return _json_loads(strip_code_fences(script))
+        except ValueError:
+            return None
+    return script
+
+
+def _semantic_key(state: Any) -> Any:
+    """Prompt inputs for the semantic cache: topic plus script draft."""
+    script = _script(state)
+    draft = script.get("draft") if isinstance(script, dict) else None
+    return {"topic": state.get("topic"), "draft": draft} if draft else None
 
 
 def create_agent() -> Any:
+    LlmAgent = load_llm_agent()
     if LlmAgent is None:
         raise RuntimeError("ADK not available. Install google-adk and retry.")
 
@@ -32,28 +56,28 @@ def create_agent() -> Any:
         - Markdown: state['voiceover_markdown']
         - Return llm_response to keep ADK postprocessors intact.
         """
+        if is_partial(llm_response):
+            return llm_response
         try:
-            text = ""
-            if getattr(llm_response, "content", None) and llm_response.content.parts:
-                text = "".join([p.text or "" for p in llm_response.content.parts])
-            parsed = json.loads(text)
+            text = extract_text(llm_response)
+            parsed = _json_loads(text)
+            vo = parsed.get("voiceover") if isinstance(parsed, dict) else parsed
             # Save structured value
+            state = callback_context.state
             try:
-                state = callback_context.state
-                state["voiceover"] = parsed.get("voiceover") if isinstance(parsed, dict) else parsed
+                state["voiceover"] = vo
             except Exception:
                 pass
+            if not ui_enabled(state):
+                return llm_response
 
-            vo = parsed.get("voiceover") if isinstance(parsed, dict) else parsed
-            lines = ["# Voiceover"]
+            md = "# Voiceover"
             if isinstance(vo, dict):
-                txt = vo.get("text") or vo.get("script") or vo
-                lines.append(str(txt))
+                md += f"\n{vo.get('text') or vo.get('script') or vo}"
             elif vo:
-                lines.append(str(vo))
-            md = "\n".join(lines)
+                md += f"\n{vo}"
             try:
-                callback_context.state["voiceover_markdown"] = md
+                state["voiceover_markdown"] = md
             except Exception:
                 pass
             return llm_response
@@ -64,8 +88,8 @@ def create_agent() -> Any:
         name="bsj_voiceover",
         model="gemini-2.5-flash",
         description="Produce voiceover-ready text from script.",
-        instruction=instruction,
+        **instruction_kwargs(instruction),
         output_key="voiceover",
-        after_model_callback=_after,
+        **semantic_callbacks("bsj_voiceover", _semantic_key, _after),
         # Let the model respond naturally; our callback renders Markdown and updates state.
     )
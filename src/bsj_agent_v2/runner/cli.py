@@ -2,36 +2,104 @@
 bsj_agent_v2.runner.cli
 
 Minimal CLI to run the BSJ v2 pipeline with ADK InMemoryRunner.
-- Accepts --topic
-- Prints final session.state as JSON
+- Accepts --topic, or --topics-file for a batch (one topic per line)
+- Prints final session.state as JSON (JSONL, one line per topic, for batches)
 - Gemini API by default (GOOGLE_API_KEY required)
 
 Usage:
   PYTHONPATH=src python3 -m bsj_agent_v2.runner.cli --topic "AI in African fintech"
+  PYTHONPATH=src python3 -m bsj_agent_v2.runner.cli --topics-file topics.txt --max-concurrency 4
 """
 from __future__ import annotations
 
 import argparse
+import asyncio
 import json
 import os
+from typing import Any, Dict, List
 
-try:
-    from google.adk.runners import InMemoryRunner
-    from google.genai import types
-except Exception as e:  # pragma: no cover
-    raise
 
-from ..workflow import build_root
+def _read_topics(path: str) -> List[str]:
+    with open(path, encoding="utf-8") as fh:
+        return [line.strip() for line in fh if line.strip()]
+
+
+async def _run_batch(
+    runner: Any, msg: Any, topics: List[str], max_concurrency: int, initial: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """Run one session per topic on a shared runner, at most max_concurrency at once."""
+    user = "bsj_cli_user"
+    sem = asyncio.Semaphore(max(1, max_concurrency))
+    service = runner.session_service
+
+    async def _run_one(i: int, topic: str) -> Dict[str, Any]:
+        sid = f"bsj_cli_session_{i}"
+        async with sem:
+            try:
+                await service.create_session(
+                    app_name=runner.app_name,
+                    user_id=user,
+                    session_id=sid,
+                    state={**initial, "topic": topic},
+                )
+                async for _ in runner.run_async(user_id=user, session_id=sid, new_message=msg):
+                    pass
+                sess = await service.get_session(app_name=runner.app_name, user_id=user, session_id=sid)
+            except Exception as e:
+                # One failed topic must not abort the rest of the batch
+                return {"topic": topic, "error": f"{type(e).__name__}: {e}"}
+        return dict(getattr(sess, "state", {}) or {})
+
+    return await asyncio.gather(*(_run_one(i, t) for i, t in enumerate(topics)))
 
 
 def main():
     parser = argparse.ArgumentParser(description="Run BSJ v2 pipeline")
-    parser.add_argument("--topic", required=True, help="Topic for the pipeline")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--topic", help="Topic for the pipeline")
+    source.add_argument("--topics-file", help="File with one topic per line; prints one JSON line per topic")
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=int(os.getenv("BSJ_MAX_CONCURRENCY", "8")),
+        help="Concurrent pipelines for --topics-file (default: $BSJ_MAX_CONCURRENCY or 8)",
+    )
+    parser.add_argument(
+        "--markdown",
+        action="store_true",
+        help="Also build the *_markdown views (only the ADK Web UI needs them)",
+    )
+    parser.add_argument(
+        "--reviews",
+        action="store_true",
+        help="Keep the human review gates (off by default: nobody approves them here)",
+    )
     args = parser.parse_args()
 
+    # Deferred until after argument parsing so --help and usage errors do not
+    # pay for importing ADK and the agent graph.
+    from google.adk.runners import InMemoryRunner
+    from google.genai import types
+
+    from ..workflow import build_app, build_root
+
     # Build the root agent graph. Set debug=True to see tool callbacks.
-    agent = build_root(debug=True)
-    runner = InMemoryRunner(agent=agent)
+    agent = build_root(debug=True, with_reviews=args.reviews)
+    app = build_app(agent)
+    runner = InMemoryRunner(app=app) if app is not None else InMemoryRunner(agent=agent)
+
+    # Message content is not used by our agents; they read session.state
+    msg = types.Content(role="user", parts=[types.Part(text="Run using session.state")])
+
+    # Headless by default: agents skip their Markdown views unless asked
+    initial: Dict[str, Any] = {} if args.markdown else {"_ui_enabled": False}
+
+    if args.topics_file:
+        # Batch mode: one runner (and one ADK/graph warmup) for every topic
+        topics = _read_topics(args.topics_file)
+        for state in asyncio.run(_run_batch(runner, msg, topics, args.max_concurrency, initial)):
+            print(json.dumps(state, ensure_ascii=False))
+        return
 
     user = "bsj_cli_user"
     sid = "bsj_cli_session"
@@ -42,13 +110,12 @@ def main():
             app_name=runner.app_name,
             user_id=user,
             session_id=sid,
-            state={"topic": args.topic},
+            state={**initial, "topic": args.topic},
         )
     except Exception:
         pass
 
-    # Kick off a single turn (message content is not used by our agents; they read session.state)
-    msg = types.Content(role="user", parts=[types.Part(text="Run using session.state")])
+    # Kick off a single turn
     for _ in runner.run(user_id=user, session_id=sid, new_message=msg):
         pass
 
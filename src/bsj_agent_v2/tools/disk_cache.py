@@ -0,0 +1,149 @@
+"""
+bsj_agent_v2.tools.disk_cache
+
+Small SQLite-backed key/value store shared by the v2 response caches, so
+entries survive process restarts (e.g. separate CLI batch runs).
+
+The database lives at `<BSJ_CACHE_DIR>/bsj_v2_cache.sqlite3` (WAL mode); with
+BSJ_CACHE_DIR unset every call is a no-op. Entries expire `BSJ_CACHE_TTL`
+seconds (default 600) after their last use, and at most `BSJ_CACHE_MAX`
+(default 1000) of the most recently used are kept. A daemon thread prunes
+expired and surplus rows in the background; reads also ignore expired rows.
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from typing import List, Optional, Tuple
+
+_FILENAME = "bsj_v2_cache.sqlite3"
+
+_LOCK = threading.Lock()
+_conn: Optional[sqlite3.Connection] = None
+_conn_path: Optional[str] = None
+_pruner: Optional[threading.Thread] = None
+
+
+def _int_env(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+def ttl() -> int:
+    """Seconds an entry lives after its last use (BSJ_CACHE_TTL, default 600)."""
+    return _int_env("BSJ_CACHE_TTL", 600)
+
+
+def max_entries() -> int:
+    """Row cap enforced by the pruner (BSJ_CACHE_MAX, default 1000)."""
+    return _int_env("BSJ_CACHE_MAX", 1000)
+
+
+def _path() -> Optional[str]:
+    base = os.getenv("BSJ_CACHE_DIR")
+    return os.path.join(base, _FILENAME) if base else None
+
+
+def _connect() -> Optional[sqlite3.Connection]:
+    """Shared connection for the current BSJ_CACHE_DIR. Caller holds _LOCK."""
+    global _conn, _conn_path, _pruner
+    path = _path()
+    if path is None:
+        return None
+    if _conn is not None and _conn_path == path:
+        return _conn
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, created REAL, value BLOB)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS cache_created ON cache (created)")
+    except sqlite3.Error:
+        return None
+    if _conn is not None:
+        _conn.close()
+    _conn, _conn_path = conn, path
+    if _pruner is None:
+        _pruner = threading.Thread(target=_prune_loop, name="bsj-disk-cache-pruner", daemon=True)
+        _pruner.start()
+    return conn
+
+
+def get(key: str) -> Optional[bytes]:
+    """Stored value for `key`, or None if missing or expired. Refreshes its age."""
+    now = time.time()
+    with _LOCK:
+        conn = _connect()
+        if conn is None:
+            return None
+        try:
+            row = conn.execute(
+                "SELECT value FROM cache WHERE key = ? AND created >= ?", (key, now - ttl())
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE cache SET created = ? WHERE key = ?", (now, key))
+        except sqlite3.Error:
+            return None
+    return row[0]
+
+
+def put(key: str, value: bytes) -> None:
+    """Store `value` under `key` (errors are ignored; the cache is best-effort)."""
+    with _LOCK:
+        conn = _connect()
+        if conn is None:
+            return
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, created, value) VALUES (?, ?, ?)",
+                (key, time.time(), value),
+            )
+        except sqlite3.Error:
+            pass
+
+
+def items(prefix: str) -> List[Tuple[str, bytes]]:
+    """Unexpired (key, value) rows whose key starts with `prefix`, oldest first."""
+    with _LOCK:
+        conn = _connect()
+        if conn is None:
+            return []
+        try:
+            return conn.execute(
+                "SELECT key, value FROM cache WHERE key >= ? AND key < ? AND created >= ?"
+                " ORDER BY created",
+                (prefix, prefix + "\uffff", time.time() - ttl()),
+            ).fetchall()
+        except sqlite3.Error:
+            return []
+
+
+def prune() -> None:
+    """Delete expired rows, then all but the BSJ_CACHE_MAX most recently used."""
+    with _LOCK:
+        conn = _connect()
+        if conn is None:
+            return
+        try:
+            conn.execute("DELETE FROM cache WHERE created < ?", (time.time() - ttl(),))
+            conn.execute(
+                "DELETE FROM cache WHERE key IN"
+                " (SELECT key FROM cache ORDER BY created DESC LIMIT -1 OFFSET ?)",
+                (max_entries(),),
+            )
+        except sqlite3.Error:
+            pass
+
+
+def _prune_loop() -> None:
+    while True:
+        time.sleep(min(ttl(), 60))
+        prune()
@@ -10,33 +10,13 @@ This keeps v2 minimal and focused while remaining extensible.
 """
 from __future__ import annotations
 
+import functools
 import os
 import os.path
-from typing import Any, List
+from typing import Any, List, Tuple
 from typing import Dict, Mapping, MutableMapping
 import json
-
-try:
-    from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset
-    from google.adk.tools.mcp_tool.mcp_session_manager import (
-        StreamableHTTPConnectionParams,
-    )
-    # Auth types from ADK for tool calling auth config
-    from google.adk.auth.auth_credential import (
-        AuthCredential,
-        AuthCredentialTypes,
-        HttpAuth,
-        HttpCredentials,
-    )
-    from fastapi.openapi.models import HTTPBase
-except Exception:  # pragma: no cover
-    MCPToolset = None  # type: ignore
-    StreamableHTTPConnectionParams = None  # type: ignore
-    AuthCredential = None  # type: ignore
-    AuthCredentialTypes = None  # type: ignore
-    HttpAuth = None  # type: ignore
-    HttpCredentials = None  # type: ignore
-    HTTPBase = None  # type: ignore
+from collections import abc
 
 
 def _normalize_base(url: str) -> str:
@@ -51,21 +31,45 @@ def build_tavily_toolset(debug: bool = False) -> List[Any]:
       - TAVILY_MCP_URL (base URL; may include "?tavilyApiKey=${TAVILY_API_KEY}")
       - TAVILY_API_KEY
     """
-    toolsets: List[Any] = []
-
-    if MCPToolset is None or StreamableHTTPConnectionParams is None:
-        if debug:
-            print("[MCP v2] ADK MCPToolset not available; skipping Tavily setup")
-        return toolsets
-
     tavily_url = _normalize_base(os.path.expandvars(os.getenv("TAVILY_MCP_URL", "")))
     tavily_key = os.getenv("TAVILY_API_KEY", "").strip()
 
     if debug:
         print(f"[MCP v2] Env detected: tavily_url={'set' if tavily_url else 'unset'}")
 
+    return list(_build_tavily_toolset_cached(tavily_url, tavily_key, debug))
+
+
+@functools.lru_cache(maxsize=8)
+def _build_tavily_toolset_cached(tavily_url: str, tavily_key: str, debug: bool) -> Tuple[Any, ...]:
+    """Build the toolset once per resolved (url, key, debug).
+
+    Agent factories (and build_root rebuilds) reuse the same MCPToolset and
+    auth objects instead of reconstructing them. Returns a tuple so callers
+    cannot mutate the cached value.
+    """
+    # Imported here rather than at module top so state helpers below (used by
+    # the normalizer) do not pull in the ADK/MCP/FastAPI graph.
+    try:
+        from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset
+        from google.adk.tools.mcp_tool.mcp_session_manager import (
+            StreamableHTTPConnectionParams,
+        )
+        # Auth types from ADK for tool calling auth config
+        from google.adk.auth.auth_credential import (
+            AuthCredential,
+            AuthCredentialTypes,
+            HttpAuth,
+            HttpCredentials,
+        )
+        from fastapi.openapi.models import HTTPBase
+    except Exception:  # pragma: no cover
+        if debug:
+            print("[MCP v2] ADK MCPToolset not available; skipping Tavily setup")
+        return ()
+
     if not tavily_url:
-        return toolsets
+        return ()
 
     # Fill the query parameter if it exists empty or not present.
     if tavily_key and "tavily" in tavily_url:
@@ -84,7 +88,7 @@ def build_tavily_toolset(debug: bool = False) -> List[Any]:
     # We expose an HTTP Bearer scheme so the UI knows the tool is authenticated.
     auth_scheme = None
     auth_credential = None
-    if HTTPBase is not None and AuthCredential is not None and tavily_key:
+    if tavily_key:
         # FastAPI OpenAPI models expose concrete security scheme models like HTTPBase
         # instead of the Union SecurityScheme, so instantiate HTTPBase directly.
         auth_scheme = HTTPBase(scheme="bearer")
@@ -96,23 +100,42 @@ def build_tavily_toolset(debug: bool = False) -> List[Any]:
             ),
         )
 
-    toolsets.append(
-        MCPToolset(
-            connection_params=conn,
-            auth_scheme=auth_scheme,
-            auth_credential=auth_credential,
-        )
+    toolset = MCPToolset(
+        connection_params=conn,
+        auth_scheme=auth_scheme,
+        auth_credential=auth_credential,
     )
 
     if debug:
         print(f"[MCP v2] Tavily toolset configured url={tavily_url}")
 
-    return toolsets
+    return (toolset,)
 
 
 # ------------------------------
 # State helpers for Web UI
 # ------------------------------
+# Leaf types that are JSON-safe by construction; only containers still need
+# a json.dumps round to prove they serialize.
+_JSON_SCALARS = (str, int, float, bool, type(None))
+
+
+def _shorten(value: Any) -> Any:
+    """Return a JSON-safe value; shorten long strings."""
+    if isinstance(value, _JSON_SCALARS):
+        if isinstance(value, str) and len(value) > 4000:
+            return value[:4000] + "…"
+        return value
+    # Sequence previews are usually flat lists of scalars: no need to encode
+    if type(value) is list and all(isinstance(v, _JSON_SCALARS) for v in value):
+        return value
+    try:
+        json.dumps(value)
+        return value
+    except Exception:
+        return str(value)
+
+
 def flatten_state(
     state: Mapping[str, Any] | None,
     *,
@@ -124,39 +147,32 @@ def flatten_state(
     - Only flattens dict-like mappings up to max_depth.
     - Lists/tuples are JSON-serialized to a short string preview.
     - Non-JSON-serializable values are stringified.
+    - Walks an explicit stack (no recursion) in the same key order as a
+      depth-first traversal.
     """
     if not state:
         return {}
 
-    def _shorten(value: Any) -> Any:
-        # Ensure JSON-safe values; shorten long strings
-        try:
-            json.dumps(value)
-            if isinstance(value, str) and len(value) > 4000:
-                return value[:4000] + "…"
-            return value
-        except Exception:
-            return str(value)
-
     out: Dict[str, Any] = {}
-
-    def _walk(prefix: str, obj: Any, depth: int) -> None:
+    stack: List[Tuple[str, Any, int]] = [("", state, 0)]
+    pop = stack.pop
+    while stack:
+        prefix, obj, depth = pop()
         if depth > max_depth:
             out[prefix] = _shorten(obj)
-            return
-
-        if isinstance(obj, Mapping):
-            for k, v in obj.items():
-                key = f"{prefix}{sep}{k}" if prefix else str(k)
-                _walk(key, v, depth + 1)
+        # typing.Mapping's isinstance goes through a slow __instancecheck__;
+        # exact dicts (nearly all session state) skip the ABC check entirely.
+        elif type(obj) is dict or isinstance(obj, abc.Mapping):
+            # Reversed so children pop in insertion order
+            stack.extend(reversed([
+                (f"{prefix}{sep}{k}" if prefix else str(k), v, depth + 1)
+                for k, v in obj.items()
+            ]))
         elif isinstance(obj, (list, tuple)):
             # Compact preview for sequences
-            preview = obj[:5] if isinstance(obj, list) else list(obj)[:5]
-            out[prefix] = _shorten(preview)
+            out[prefix] = _shorten(obj[:5] if isinstance(obj, list) else list(obj)[:5])
         else:
             out[prefix] = _shorten(obj)
-
-    _walk("", state, 0)
     return out
 
 
@@ -167,16 +183,5 @@ def validate_state_for_ui(state: Mapping[str, Any] | None) -> Dict[str, Any]:
     - Truncates overly long strings to keep UI responsive.
     - Drops keys that fail basic validation.
     """
-    flat = flatten_state(state)
-    safe: Dict[str, Any] = {}
-
-    for k, v in flat.items():
-        if not isinstance(k, str) or not k:
-            continue
-        try:
-            json.dumps(v)
-            safe[k] = v
-        except Exception:
-            safe[k] = str(v)
-
-    return safe
+    # flatten_state already made every value JSON-safe; only keys remain
+    return {k: v for k, v in flatten_state(state).items() if k}
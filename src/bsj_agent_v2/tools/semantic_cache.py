@@ -0,0 +1,261 @@
+"""
+bsj_agent_v2.tools.semantic_cache
+
+Opt-in semantic response cache for the v2 LlmAgents.
+
+When `BSJ_SEMANTIC_CACHE=1`, an agent's prompt inputs (a slice of session
+state) are embedded with Gemini `embed_content`; if an earlier response for
+the same agent was produced from inputs whose embedding has cosine similarity
+>= `BSJ_SEMANTIC_CACHE_THRESHOLD` (default 0.92), that response is served
+without calling the model. Exact repeats are matched by hash and skip the
+embedding call too.
+
+Entries live in a per-agent in-memory LRU (256 entries); with `BSJ_CACHE_DIR`
+set they are also persisted in the shared SQLite store (`disk_cache`, LRU with
+a `BSJ_CACHE_TTL` expiry). Responses are stored there by exact input hash
+too, so a rerun hits even when embeddings are unavailable.
+
+Agents wire it in through `semantic_callbacks`, which wraps their existing
+after_model_callback and adds a before_model_callback.
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import math
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from . import disk_cache
+
+# Optional fast JSON; both decoders raise ValueError subclasses.
+try:
+    import orjson
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+_MAX_ENTRIES = 256
+# Embedding models cap their input; the head of the prompt slice is enough
+# to tell near-duplicates apart.
+_MAX_EMBED_CHARS = 8000
+
+# agent -> OrderedDict[key hash -> (unit vector, response text)]
+_ENTRIES: Dict[str, "OrderedDict[str, Tuple[List[float], str]]"] = {}
+_LOCK = threading.Lock()
+
+
+def enabled() -> bool:
+    """True when BSJ_SEMANTIC_CACHE=1."""
+    return os.getenv("BSJ_SEMANTIC_CACHE", "0") == "1"
+
+
+def threshold() -> float:
+    """Minimum cosine similarity for a hit (BSJ_SEMANTIC_CACHE_THRESHOLD)."""
+    try:
+        return float(os.getenv("BSJ_SEMANTIC_CACHE_THRESHOLD", "0.92"))
+    except ValueError:
+        return 0.92
+
+
+def key_text(value: Any) -> str:
+    """Stable text form of a state slice, used both for hashing and embedding."""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str).decode()
+    return json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+
+
+def _hash(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def _client() -> Optional[Any]:
+    try:
+        from google import genai
+
+        return genai.Client()
+    except Exception:
+        return None
+
+
+async def _embed(text: str) -> Optional[List[float]]:
+    """Unit-length embedding of `text`, or None if embedding is unavailable."""
+    client = _client()
+    if client is None:
+        return None
+    try:
+        resp = await client.aio.models.embed_content(
+            model=os.getenv("BSJ_EMBED_MODEL", "text-embedding-004"),
+            contents=text[:_MAX_EMBED_CHARS],
+        )
+        values = list(resp.embeddings[0].values or [])
+    except Exception:
+        return None
+    norm = math.sqrt(sum(v * v for v in values))
+    if not norm:
+        return None
+    return [v / norm for v in values]
+
+
+def _vector_prefix(agent: str) -> str:
+    return f"semantic:{agent}:"
+
+
+def _exact_key(agent: str, h: str) -> str:
+    return f"prompt:{agent}:{h}"
+
+
+def _load(agent: str) -> "OrderedDict[str, Tuple[List[float], str]]":
+    """The agent's persisted entries, oldest first (blocking SQLite read)."""
+    entries: "OrderedDict[str, Tuple[List[float], str]]" = OrderedDict()
+    prefix = _vector_prefix(agent)
+    for key, value in disk_cache.items(prefix)[-_MAX_ENTRIES:]:
+        try:
+            vec, text = _json_loads(value)
+        except (ValueError, TypeError):
+            continue
+        entries[key[len(prefix):]] = (vec, text)
+    return entries
+
+
+async def _entries(agent: str) -> "OrderedDict[str, Tuple[List[float], str]]":
+    """The agent's LRU, loaded from the disk store on first use.
+
+    The read runs in a worker thread and outside _LOCK; if two callers race,
+    the first one to install its rows wins.
+    """
+    entries = _ENTRIES.get(agent)
+    if entries is None:
+        loaded = await asyncio.to_thread(_load, agent)
+        with _LOCK:
+            entries = _ENTRIES.setdefault(agent, loaded)
+    return entries
+
+
+def _persist(agent: str, h: str, vec: List[float], text: str) -> None:
+    row = [vec, text]
+    disk_cache.put(
+        _vector_prefix(agent) + h,
+        orjson.dumps(row) if orjson is not None else json.dumps(row).encode("utf-8"),
+    )
+
+
+async def lookup(agent: str, text: str) -> Optional[str]:
+    """Cached response for inputs identical or similar to `text`, else None."""
+    h = _hash(text)
+    entries = await _entries(agent)
+    with _LOCK:
+        hit = entries.get(h)
+        if hit is not None:
+            entries.move_to_end(h)
+            return hit[1]
+    # Exact repeat stored by this or another process
+    exact = await asyncio.to_thread(disk_cache.get, _exact_key(agent, h))
+    if exact is not None:
+        return exact.decode("utf-8")
+    if not entries:
+        return None
+    vec = await _embed(text)
+    if vec is None:
+        return None
+    best_key, best_score = None, threshold()
+    with _LOCK:
+        for k, (other, _) in entries.items():
+            score = sum(a * b for a, b in zip(vec, other))
+            if score >= best_score:
+                best_key, best_score = k, score
+        if best_key is None:
+            return None
+        entries.move_to_end(best_key)
+        return entries[best_key][1]
+
+
+async def remember(agent: str, text: str, response: str) -> None:
+    """Store `response` as the answer to inputs `text`."""
+    h = _hash(text)
+    entries = await _entries(agent)
+    with _LOCK:
+        if h in entries:
+            return
+    await asyncio.to_thread(disk_cache.put, _exact_key(agent, h), response.encode("utf-8"))
+    vec = await _embed(text)
+    if vec is None:
+        return
+    with _LOCK:
+        entries[h] = (vec, response)
+        while len(entries) > _MAX_ENTRIES:
+            entries.popitem(last=False)
+    await asyncio.to_thread(_persist, agent, h, vec, response)
+
+
+async def get_or_compute(agent: str, text: str, compute_fn: Callable[[], Awaitable[str]]) -> str:
+    """Return a cached response for `text`, or await compute_fn() and cache it."""
+    cached = await lookup(agent, text)
+    if cached is not None:
+        return cached
+    response = await compute_fn()
+    await remember(agent, text, response)
+    return response
+
+
+def semantic_callbacks(
+    agent: str,
+    key_fn: Callable[[Any], Any],
+    after: Callable[[Any, Any], Any],
+) -> Dict[str, Any]:
+    """LlmAgent kwargs adding the semantic cache around `after`.
+
+    `key_fn(state)` returns the state slice the agent's prompt depends on
+    (falsy to bypass the cache). On a hit the cached text is wrapped in an
+    LlmResponse, passed through `after` so state and Markdown are written as
+    usual, and returned from before_model_callback so the model is skipped.
+    Responses are remembered only when they parse as JSON. Returns just
+    `after_model_callback=after` when the cache is disabled.
+    """
+    if not enabled():
+        return {"after_model_callback": after}
+
+    async def _after(callback_context: Any, llm_response: Any) -> Any:
+        result = after(callback_context, llm_response)
+        if inspect.isawaitable(result):
+            result = await result
+        from ..agents._util import extract_text, is_partial, strip_code_fences
+
+        if is_partial(llm_response):
+            return result
+        slice_ = key_fn(callback_context.state)
+        text = extract_text(llm_response)
+        if slice_ and text:
+            try:
+                _json_loads(strip_code_fences(text))
+            except ValueError:
+                return result
+            await remember(agent, key_text(slice_), text)
+        return result
+
+    async def _before(callback_context: Any, llm_request: Any) -> Any:
+        slice_ = key_fn(callback_context.state)
+        if not slice_:
+            return None
+        text = await lookup(agent, key_text(slice_))
+        if text is None:
+            return None
+        try:
+            from google.adk.models import LlmResponse
+            from google.genai import types
+        except Exception:  # pragma: no cover
+            return None
+        response = LlmResponse(content=types.Content(role="model", parts=[types.Part(text=text)]))
+        result = after(callback_context, response)
+        if inspect.isawaitable(result):
+            result = await result
+        return result if result is not None else response
+
+    return {"before_model_callback": _before, "after_model_callback": _after}
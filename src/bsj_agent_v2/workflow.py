@@ -8,13 +8,9 @@ ADK-native orchestration for BSJ pipeline (v2):
 """
 from __future__ import annotations
 
-from typing import Any, List
-
-try:
-    from google.adk.agents import SequentialAgent, ParallelAgent
-except Exception:  # pragma: no cover
-    SequentialAgent = None  # type: ignore
-    ParallelAgent = None  # type: ignore
+import functools
+import os
+from typing import Any, List, Optional
 
 from .agents.researcher import create_agent as create_researcher
 from .agents.scriptwriter import create_agent as create_scriptwriter
@@ -22,45 +18,81 @@ from .agents.thumbnail_promptor import create_agent as create_thumbnail_promptor
 from .agents.captioner import create_agent as create_captioner
 from .agents.voiceover import create_agent as create_voiceover
 from .agents.review_gate import create_review_agent as create_review_gate
+from .agents._adk import load_context_cache_config, load_workflow_agents
+
 
+def _reviews_enabled() -> bool:
+    """BSJ_REVIEWS=0 drops the human review gates (default: on)."""
+    return os.getenv("BSJ_REVIEWS", "1") != "0"
 
-def build_root(*, debug: bool = False) -> Any:
+
+@functools.lru_cache(maxsize=4)
+def build_root(*, debug: bool = False, with_reviews: Optional[bool] = None) -> Any:
     """Build the root agent graph for BSJ v2.
 
+    The graph is built once per (`debug`, `with_reviews`) and shared: ADK
+    agents hold no per-session data (state lives on the session), so every
+    runner can reuse it. Call `build_root.cache_clear()` for a fresh graph,
+    e.g. after changing BSJ_* env settings.
+
+    `with_reviews=False` leaves out the research/script review gates, so
+    unattended runs never wait on an approval; None defers to BSJ_REVIEWS.
+
     Returns:
       A composed ADK agent (SequentialAgent) that can be run by InMemoryRunner
       or served via ADK Web UI.
     """
+    SequentialAgent, ParallelAgent = load_workflow_agents()
     if SequentialAgent is None or ParallelAgent is None:
         raise RuntimeError("ADK not available. Install google-adk and retry.")
 
-    researcher = create_researcher(debug=debug)
-    research_review = create_review_gate(
-        name="bsj_research_review",
-        markdown_state_key="research_markdown",
-        approval_state_key="research_review",
-    )
-    scriptwriter = create_scriptwriter()
-    script_review = create_review_gate(
-        name="bsj_script_review",
-        markdown_state_key="script_markdown",
-        approval_state_key="script_review",
-    )
+    if with_reviews is None:
+        with_reviews = _reviews_enabled()
+
+    stages: List[Any] = [create_researcher(debug=debug)]
+    if with_reviews:
+        stages.append(
+            create_review_gate(
+                name="bsj_research_review",
+                markdown_state_key="research_markdown",
+                approval_state_key="research_review",
+            )
+        )
+    stages.append(create_scriptwriter())
+    if with_reviews:
+        stages.append(
+            create_review_gate(
+                name="bsj_script_review",
+                markdown_state_key="script_markdown",
+                approval_state_key="script_review",
+            )
+        )
+    # ParallelAgent already runs each branch as its own asyncio task
+    # (TaskGroup, or gather on 3.10), so the two Gemini calls overlap and the
+    # stage costs max(t_thumb, t_caption). The branches write disjoint state
+    # keys (thumbnail_prompts*, captions*), so their deltas never collide.
     assets_parallel = ParallelAgent(
         name="bsj_assets_parallel",
         sub_agents=[create_thumbnail_promptor(), create_captioner()],
     )
-    voiceover = create_voiceover()
-
-    root = SequentialAgent(
-        name="bsj_pipeline_v2",
-        sub_agents=[
-            researcher,
-            research_review,
-            scriptwriter,
-            script_review,
-            assets_parallel,
-            voiceover,
-        ],
-    )
+    stages.append(assets_parallel)
+    stages.append(create_voiceover())
+
+    root = SequentialAgent(name="bsj_pipeline_v2", sub_agents=stages)
     return root
+
+
+def build_app(root: Any) -> Optional[Any]:
+    """Wrap `root` in an ADK App with Gemini context caching, if enabled.
+
+    Returns None when BSJ_ENABLE_GEMINI_CACHE is off or the installed ADK has
+    no App/ContextCacheConfig, in which case callers use `root` directly.
+    """
+    cache_config = load_context_cache_config()
+    if cache_config is None:
+        return None
+    try:
+        from google.adk.apps import App
+    except Exception:  # pragma: no cover
+        return None
+    return App(name="bsj_agent_v2", root_agent=root, context_cache_config=cache_config)